@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+"""
+Pipeline Benchmark — بنچمارک سرتاسری خط تولید کاور
+یک مجموعه مصنوعی MDX (فارسی/انگلیسی) می‌سازد، هر مرحله و کل خط را اندازه می‌گیرد
+و نتیجه را به‌صورت JSON برای مقایسه بین کامیت‌ها ذخیره می‌کند
+"""
+
+import io
+import sys
+import json
+import time
+import random
+import shutil
+import platform
+import argparse
+import tempfile
+import subprocess
+import contextlib
+from pathlib import Path
+
+from getData import scan_mdx_files, build_cover_prompt, save_json, save_markdown_report, save_agent_batch
+from coverStore import assign_cover_keys
+from coverTask import CoverTask
+from svgGenerator import generate_cover_svg, export_png, export_png_composited
+from benchTaskMemory import TAG_POOL, CATEGORY_POOL
+
+COLLECTIONS = ["articles", "books", "wiki", "statements", "proposals", "dialogues"]
+
+FA_WORDS = ("گذار دموکراتیک جامعه مدنی آزادی انقلاب فلسفه تاریخ ارتش نهاد قانون "
+            "اساسی حقوق بشر عدالت انتخابات مشارکت سیاسی رژیم اقتدارگرا اصلاحات").split()
+EN_WORDS = ("democratic transition civil society freedom revolution philosophy history "
+            "army institution constitution human rights justice election participation").split()
+
+
+# ─────────────────────────────────────────────────────
+# 1. تولید مجموعه مصنوعی
+# ─────────────────────────────────────────────────────
+def _sentence(rng: random.Random, words: list[str], size: int) -> str:
+    return " ".join(rng.choice(words) for _ in range(size))
+
+
+def generate_corpus(root: Path, count: int, seed: int = 7) -> list[Path]:
+    """count فایل MDX با فرانت‌متر واقعی‌نما و بدنه‌هایی با اندازه متغیر می‌سازد."""
+    rng = random.Random(seed)
+    files = []
+    for i in range(count):
+        # زوج‌های ترجمه: هر دو فایل پشت‌سرهم یک slug در fa و en دارند
+        lang = "fa" if i % 2 == 0 else "en"
+        words = FA_WORDS if lang == "fa" else EN_WORDS
+        collection = COLLECTIONS[(i // 2) % len(COLLECTIONS)]
+        slug = f"synthetic-{i // 2}"
+
+        tags = rng.sample(TAG_POOL, rng.randint(2, 6))
+        categories = rng.sample(CATEGORY_POOL, rng.randint(1, 2))
+        # بدنه: توزیع لگ‌نرمال — بیشتر کوتاه، تعدادی خیلی بلند
+        paragraphs = max(1, int(rng.lognormvariate(2.5, 1.0)))
+
+        lines = [
+            "---",
+            f'title: "{_sentence(rng, words, rng.randint(3, 9))}"',
+            f'description: "{_sentence(rng, words, rng.randint(10, 30))}"',
+            f"lang: {lang}",
+            "publishDate: '2025-01-01'",
+            "author: مهدی سالم",
+            "draft: false",
+            "tags:",
+            *[f"  - {t}" for t in tags],
+            "categories:",
+            *[f"  - {c}" for c in categories],
+            f'slug: "{slug}"',
+            "---",
+            "",
+        ]
+        for p in range(paragraphs):
+            if p % 7 == 0:
+                lines.append(f"## {_sentence(rng, words, 4)}\n")
+            lines.append(_sentence(rng, words, rng.randint(30, 120)) + "\n")
+
+        path = root / collection / lang / f"{slug}.mdx"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text("\n".join(lines), encoding="utf-8")
+        files.append(path)
+    return files
+
+
+# ─────────────────────────────────────────────────────
+# 2. اندازه‌گیری مراحل
+# ─────────────────────────────────────────────────────
+def timed(fn, repeat: int) -> tuple[float, object]:
+    """بهترین زمان از repeat اجرا؛ خروجی چاپی مراحل حذف می‌شود."""
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        with contextlib.redirect_stdout(io.StringIO()):
+            started = time.perf_counter()
+            result = fn()
+            elapsed = time.perf_counter() - started
+        best = min(best, elapsed)
+    return best, result
+
+
+def run_pipeline(corpus: Path, out: Path, png: bool) -> int:
+    """کل خط: اسکن ← پرامپت ← کلید کاور ← گزارش‌ها ← SVG (+PNG)."""
+    entries = scan_mdx_files(str(corpus))
+    tasks = [CoverTask.from_entry(entry) for entry in entries]  # مثل getData.main
+    assign_cover_keys(tasks)
+
+    out.mkdir(parents=True, exist_ok=True)
+    save_json(tasks, str(out / "cover-tasks.json"))
+    save_markdown_report(tasks, str(out / "cover-tasks.md"))
+    save_agent_batch(tasks, str(out / "agent-batch.txt"))
+
+    for task in tasks:
+        svg = generate_cover_svg(task)
+        (out / f"{task['slug']}-{task['lang']}-cover.svg").write_text(svg, encoding="utf-8")
+        if png:
+            export_png(svg, out / f"{task['slug']}-{task['lang']}-cover.png")
+    return len(tasks)
+
+
+def run_benchmarks(corpus: Path, workdir: Path, repeat: int, png_limit: int) -> dict:
+    stages = {}
+
+    def record(name: str, seconds: float, items: int):
+        stages[name] = {
+            "items": items,
+            "seconds": round(seconds, 4),
+            "per_item_ms": round(seconds * 1000 / max(items, 1), 4),
+            "items_per_sec": round(items / seconds, 1) if seconds else None,
+        }
+
+    seconds, entries = timed(lambda: scan_mdx_files(str(corpus)), repeat)
+    record("scan_mdx_files", seconds, len(entries))
+
+    seconds, tasks = timed(lambda: [build_cover_prompt(e) for e in entries], repeat)
+    record("build_cover_prompt", seconds, len(tasks))
+
+    seconds, svgs = timed(lambda: [generate_cover_svg(t) for t in tasks], repeat)
+    record("generate_cover_svg", seconds, len(svgs))
+
+    png_enabled = False
+    if png_limit:
+        try:
+            import cairosvg  # noqa: F401
+            png_enabled = True
+        except (ImportError, OSError):
+            print("  ⚠️  cairosvg نصب نیست — مرحله PNG رد شد", file=sys.stderr)
+
+    if png_enabled:
+        sample = svgs[:png_limit]
+        png_dir = workdir / "png"
+        png_dir.mkdir(parents=True, exist_ok=True)
+        seconds, _ = timed(
+            lambda: [export_png(svg, png_dir / f"{i}.png") for i, svg in enumerate(sample)],
+            repeat,
+        )
+        record("export_png", seconds, len(sample))
+
+        try:
+            import PIL  # noqa: F401
+            seconds, _ = timed(
+                lambda: [
+                    export_png_composited(task, png_dir / f"c{i}.png")
+                    for i, task in enumerate(tasks[:png_limit])
+                ],
+                repeat,
+            )
+            record("export_png_composited", seconds, len(sample))
+        except ImportError:
+            print("  ⚠️  Pillow نصب نیست — مرحله ترکیب لایه‌ها رد شد", file=sys.stderr)
+
+    def full():
+        out = workdir / "pipeline"
+        shutil.rmtree(out, ignore_errors=True)
+        return run_pipeline(corpus, out, png=False)
+
+    seconds, count = timed(full, repeat)
+    record("pipeline", seconds, count)
+    return stages
+
+
+# ─────────────────────────────────────────────────────
+# 3. گزارش و مقایسه
+# ─────────────────────────────────────────────────────
+def git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def compare(current: dict, baseline: dict):
+    """تفاوت هر مرحله با نتیجه قبلی (مثبت = کندتر)."""
+    print(f"\n📈 مقایسه با {baseline.get('commit', '?')}:")
+    for name, stage in current["stages"].items():
+        old = baseline.get("stages", {}).get(name)
+        if not old:
+            print(f"   {name:<20} (جدید)")
+            continue
+        delta = (stage["per_item_ms"] - old["per_item_ms"]) / max(old["per_item_ms"], 1e-9) * 100
+        print(f"   {name:<20} {old['per_item_ms']:>9.4f} → {stage['per_item_ms']:>9.4f} ms/item  ({delta:+.1f}%)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="بنچمارک سرتاسری خط تولید کاور")
+    parser.add_argument("-n", "--count", type=int, default=2000, help="تعداد فایل MDX مصنوعی")
+    parser.add_argument("-r", "--repeat", type=int, default=3, help="تعداد تکرار هر مرحله (بهترین زمان)")
+    parser.add_argument("--png", type=int, default=20, help="تعداد کاور برای مرحله PNG (0 = رد)")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--corpus", default=None, help="پوشه مجموعه موجود (بدون تولید دوباره)")
+    parser.add_argument("-o", "--output", default=None, help="مسیر ذخیره نتیجه JSON")
+    parser.add_argument("--compare", default=None, help="فایل JSON نتیجه قبلی برای مقایسه")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="cover-bench-") as tmp:
+        workdir = Path(tmp)
+        if args.corpus:
+            corpus = Path(args.corpus)
+        else:
+            corpus = workdir / "corpus"
+            started = time.perf_counter()
+            generate_corpus(corpus, args.count, args.seed)
+            print(f"🧪 {args.count} فایل مصنوعی ساخته شد ({time.perf_counter() - started:.1f}s)")
+
+        stages = run_benchmarks(corpus, workdir, args.repeat, args.png)
+
+    result = {
+        "commit": git_commit(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "count": args.count if not args.corpus else None,
+        "seed": args.seed,
+        "repeat": args.repeat,
+        "stages": stages,
+    }
+
+    print(f"\n{'─' * 50}")
+    for name, stage in stages.items():
+        print(f"  {name:<20} {stage['seconds']:>8.3f}s  {stage['per_item_ms']:>9.4f} ms/item")
+    print(f"{'─' * 50}")
+
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            compare(result, json.load(f))
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(result, f, ensure_ascii=False, indent=2)
+        print(f"\n💾 نتیجه ذخیره شد: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
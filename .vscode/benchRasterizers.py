@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Rasterizer Benchmark — مقایسه بک‌اندهای SVG→PNG روی یک مجموعه تسک یکسان
+سرعت (کاور بر ثانیه) و اختلاف پیکسلی هر بک‌اند نسبت به مرجع را گزارش می‌کند
+"""
+
+import io
+import json
+import functools
+import time
+import argparse
+import tempfile
+from pathlib import Path
+
+from getData import build_cover_prompt
+from svgGenerator import WIDTH, HEIGHT, generate_cover_svg
+from rasterizers import RASTERIZERS, get_rasterizer
+from benchTaskMemory import synthetic_entries
+
+
+def load_tasks(input_json: str | None, count: int) -> list[dict]:
+    if input_json:
+        with open(input_json, "r", encoding="utf-8") as f:
+            return json.load(f)[:count]
+    return [build_cover_prompt(entry) for entry in synthetic_entries(count)]
+
+
+def pixel_diff(reference: bytes, other: bytes) -> dict | None:
+    """میانگین اختلاف کانال‌ها (۰ تا ۲۵۵) و درصد پیکسل‌هایی که دست‌کم یک کانالشان (RGBA) بیش از ۸ واحد فرق دارد."""
+    try:
+        from PIL import Image, ImageChops
+    except ImportError:
+        return None
+
+    a = Image.open(io.BytesIO(reference)).convert("RGBA")
+    b = Image.open(io.BytesIO(other)).convert("RGBA")
+    if a.size != b.size:
+        return {"mean_abs": None, "pct_pixels_over_8": 100.0, "size_mismatch": True}
+
+    diff = ImageChops.difference(a, b)
+    histogram = diff.histogram()  # ۴ کانال × ۲۵۶
+    channels = [histogram[i * 256:(i + 1) * 256] for i in range(4)]
+    total = a.size[0] * a.size[1]
+    mean_abs = sum(v * n for ch in channels for v, n in enumerate(ch)) / (total * 4)
+
+    # بیشینه‌ی اختلاف هر پیکسل روی چهار کانال — convert("L") آبی و آلفا را عملاً حذف می‌کرد
+    worst = functools.reduce(ImageChops.lighter, diff.split())
+    mask = worst.point(lambda v: 255 if v > 8 else 0)
+    over = mask.histogram()[255]
+    return {"mean_abs": round(mean_abs, 3), "pct_pixels_over_8": round(over * 100 / total, 3)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="بنچمارک بک‌اندهای rasterizer")
+    parser.add_argument("input_json", nargs="?", default=None, help="cover-tasks.json (پیش‌فرض: تسک‌های مصنوعی)")
+    parser.add_argument("-n", "--count", type=int, default=30, help="تعداد کاور")
+    parser.add_argument("-j", "--jobs", type=int, default=4, help="پردازه‌های هم‌زمان برای بک‌اندهای زیرپردازه‌ای")
+    parser.add_argument("--reference", default="cairosvg", help="بک‌اند مرجع برای مقایسه پیکسلی")
+    parser.add_argument("-o", "--output", default=None, help="مسیر ذخیره نتیجه JSON")
+    args = parser.parse_args()
+
+    tasks = load_tasks(args.input_json, args.count)
+    svgs = [generate_cover_svg(task) for task in tasks]
+
+    backends = [
+        name for name, cls in RASTERIZERS.items()
+        if name != "none" and cls.available()
+    ]
+    skipped = [name for name in RASTERIZERS if name != "none" and name not in backends]
+    if skipped:
+        print(f"⚠️  در دسترس نیست: {', '.join(skipped)}")
+    if not backends:
+        print("❌ هیچ بک‌اند PNG نصب نیست (cairosvg / rsvg-convert / resvg)")
+        return
+
+    results = {}
+    rendered = {}
+
+    with tempfile.TemporaryDirectory(prefix="raster-bench-") as tmp:
+        for name in backends:
+            rasterizer = get_rasterizer(name, WIDTH, HEIGHT, args.jobs)
+            out = Path(tmp) / name
+            out.mkdir()
+            jobs = [(svg, out / f"{i}.png") for i, svg in enumerate(svgs)]
+
+            started = time.perf_counter()
+            try:
+                rasterizer.render_many(jobs)
+            except (RuntimeError, OSError) as e:
+                print(f"❌ {name}: {e}")
+                results[name] = {"covers": len(jobs), "error": str(e)}
+                continue
+            elapsed = time.perf_counter() - started
+
+            rendered[name] = [path.read_bytes() for _, path in jobs]
+            results[name] = {
+                "covers": len(jobs),
+                "seconds": round(elapsed, 3),
+                "covers_per_sec": round(len(jobs) / elapsed, 2) if elapsed else None,
+            }
+
+    # اختلاف پیکسلی نسبت به مرجع (میانگین روی همه کاورها)
+    succeeded = [name for name in backends if name in rendered]
+    reference_name = args.reference if args.reference in succeeded else (succeeded or [None])[0]
+    for name in succeeded:
+        if name == reference_name:
+            continue
+        diffs = [pixel_diff(ref, other) for ref, other in zip(rendered[reference_name], rendered[name])]
+        if any(d is None for d in diffs):
+            results[name]["parity"] = "Pillow نصب نیست"
+            continue
+        means = [d["mean_abs"] for d in diffs if d["mean_abs"] is not None]
+        results[name]["parity"] = {
+            "reference": reference_name,
+            "mean_abs": round(sum(means) / len(means), 3) if means else None,
+            "max_pct_pixels_over_8": max(d["pct_pixels_over_8"] for d in diffs),
+        }
+
+    print(f"\n{'─' * 60}")
+    for name, r in results.items():
+        if "error" in r:
+            print(f"  {name:<14} {'خطا':>8}              {r['error']}")
+            continue
+        parity = r.get("parity")
+        if isinstance(parity, dict):
+            parity_text = f"Δ={parity['mean_abs']}  >8: {parity['max_pct_pixels_over_8']}%"
+        else:
+            parity_text = parity or "(مرجع)"
+        print(f"  {name:<14} {r['covers_per_sec']:>8} کاور/ثانیه   {parity_text}")
+    print(f"{'─' * 60}")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({"jobs": args.jobs, "backends": results}, f, ensure_ascii=False, indent=2)
+        print(f"\n💾 نتیجه ذخیره شد: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Task Memory Benchmark — مقایسه حافظه تسک‌های dict با رکورد فشرده CoverTask
+روی یک مجموعه مصنوعی (پیش‌فرض ۱۰۰ هزار تسک)
+"""
+
+import gc
+import json
+import random
+import argparse
+import tracemalloc
+
+from getData import build_cover_prompt
+from coverTask import CoverTask
+
+TAG_POOL = ["دموکراسی", "گذار", "انقلاب", "آزادی", "فلسفه", "تاریخ", "democracy",
+            "transition", "revolution", "ethics", "politics", "iran", "army", "freedom"]
+CATEGORY_POOL = ["سیاست", "فلسفه", "تاریخ", "politics", "philosophy", "history"]
+
+
+def synthetic_entries(count: int, seed: int = 42) -> list[dict]:
+    """فرانت‌متر مصنوعی — رشته‌ها مثل خروجی yaml هر بار شیء تازه‌اند."""
+    rng = random.Random(seed)
+    entries = []
+    for i in range(count):
+        lang = rng.choice(["fa", "en"])
+        entries.append({
+            "title": f"مقاله شماره {i} — Article {i}",
+            "description": f"توضیح کوتاه برای مقاله {i}. " * rng.randint(1, 4),
+            "lang": "".join(lang),
+            # join تضمین می‌کند هر تگ یک شیء جدا باشد (مثل yaml.safe_load)
+            "tags": ["".join(list(t)) for t in rng.sample(TAG_POOL, rng.randint(2, 6))],
+            "categories": ["".join(list(c)) for c in rng.sample(CATEGORY_POOL, rng.randint(1, 2))],
+            "slug": f"article-{i}",
+            "_source_file": f"src/content/articles/{lang}/article-{i}.mdx",
+        })
+    return entries
+
+
+def measure(builder, entries: list[dict]) -> tuple[int, list]:
+    """حافظه‌ی اختصاص‌یافته برای ساخت تسک‌ها (بدون خود فرانت‌متر)."""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    tasks = [builder(entry) for entry in entries]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return after - before, tasks
+
+
+def main():
+    parser = argparse.ArgumentParser(description="بنچمارک حافظه تسک‌های کاور")
+    parser.add_argument("-n", "--count", type=int, default=100_000, help="تعداد تسک مصنوعی")
+    parser.add_argument("--json", action="store_true", help="خروجی ماشین‌خوان")
+    args = parser.parse_args()
+
+    entries = synthetic_entries(args.count)
+
+    dict_bytes, dict_tasks = measure(build_cover_prompt, entries)
+    del dict_tasks
+    record_bytes, records = measure(CoverTask.from_entry, entries)
+
+    # بررسی سازگاری: رکورد باید همان dict قدیمی را بازسازی کند
+    assert records[0].to_dict() == build_cover_prompt(entries[0])
+
+    result = {
+        "tasks": args.count,
+        "dict_bytes_per_task": round(dict_bytes / args.count, 1),
+        "record_bytes_per_task": round(record_bytes / args.count, 1),
+        "ratio": round(dict_bytes / max(record_bytes, 1), 2),
+    }
+
+    if args.json:
+        print(json.dumps(result))
+        return
+
+    print(f"📊 {result['tasks']:,} تسک مصنوعی")
+    print(f"   dict       : {result['dict_bytes_per_task']:>8} بایت/تسک")
+    print(f"   CoverTask  : {result['record_bytes_per_task']:>8} بایت/تسک")
+    print(f"   کاهش       : {result['ratio']}×")
+
+
+if __name__ == "__main__":
+    main()
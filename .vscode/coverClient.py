@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Cover Client — کلاینت سبک برای coverDaemon.py
+فقط کتابخانه استاندارد — بدون yaml و cairosvg تا اجرا سریع بماند
+"""
+
+import os
+import sys
+import json
+import socket
+import argparse
+import tempfile
+
+
+
+def default_socket_path() -> str:
+    """socket در XDG_RUNTIME_DIR (فقط برای همین کاربر)؛ وگرنه پوشه موقت با uid در نام."""
+    runtime = os.environ.get("XDG_RUNTIME_DIR")
+    base = runtime if runtime and os.path.isdir(runtime) else tempfile.gettempdir()
+    uid = os.getuid() if hasattr(os, "getuid") else os.getpid()
+    return os.path.join(base, f"cover-daemon-{uid}.sock")
+
+
+SOCKET_PATH = os.environ.get("COVER_DAEMON_SOCKET") or default_socket_path()
+
+
+def request(payload: dict, socket_path: str = SOCKET_PATH, timeout: float = 60.0) -> dict:
+    """یک درخواست JSON بفرست و پاسخ را برگردان."""
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(timeout)
+        sock.connect(socket_path)
+        sock.sendall((json.dumps(payload, ensure_ascii=False) + "\n").encode("utf-8"))
+        with sock.makefile("rb") as reader:
+            return json.loads(reader.readline())
+
+
+def main():
+    parser = argparse.ArgumentParser(description="کلاینت daemon کاور")
+    parser.add_argument("cmd", choices=["cover", "rescan", "ping", "shutdown"])
+    parser.add_argument("file", nargs="?", help="فایل MDX (برای cover)")
+    parser.add_argument("--png", action="store_true", help="PNG هم ساخته شود")
+    parser.add_argument("--socket", default=SOCKET_PATH)
+    args = parser.parse_args()
+
+    payload = {"cmd": args.cmd}
+    if args.cmd == "cover":
+        if not args.file:
+            parser.error("برای cover مسیر فایل لازم است")
+        payload.update(file=os.path.abspath(args.file), png=args.png)
+
+    try:
+        response = request(payload, args.socket)
+    except (FileNotFoundError, ConnectionRefusedError):
+        print(f"❌ daemon در دسترس نیست: {args.socket}")
+        print("   💡 اجرا: python .vscode/coverDaemon.py src/content")
+        return 2
+
+    if not response.get("ok"):
+        print(f"❌ {response.get('error')}")
+        return 1
+
+    ms = response.pop("ms", None)
+    response.pop("ok")
+    print(f"✅ {args.cmd} ({ms} ms) {json.dumps(response, ensure_ascii=False)}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
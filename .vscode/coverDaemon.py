@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""
+Cover Daemon — سرویس ماندگار تولید کاور روی Unix socket
+ماژول‌ها، ایندکس فرانت‌متر و کش تم‌ها گرم می‌مانند؛ کلاینت: coverClient.py
+"""
+
+import os
+import sys
+import json
+import stat
+import time
+import argparse
+import threading
+import socketserver
+from pathlib import Path
+
+from getData import extract_frontmatter, save_json
+from coverTask import CoverTask
+from coverStore import assign_cover_keys
+from coverClient import SOCKET_PATH, request
+from svgGenerator import write_cover, detect_theme
+
+
+# ─────────────────────────────────────────────────────
+# ایندکس فرانت‌متر — فقط فایل‌های تغییرکرده دوباره خوانده می‌شوند
+# ─────────────────────────────────────────────────────
+class FrontmatterIndex:
+    def __init__(self, root: Path):
+        self.root = root
+        self.entries: dict[str, tuple[float, dict]] = {}
+        self.lock = threading.Lock()
+
+    def load(self, filepath: Path) -> dict | None:
+        """یک فایل را (در صورت تغییر mtime) دوباره استخراج می‌کند."""
+        key = str(filepath)
+        mtime = filepath.stat().st_mtime
+        cached = self.entries.get(key)
+        if cached and cached[0] == mtime:
+            return cached[1]
+
+        entry = extract_frontmatter(filepath)
+        if entry:
+            self.entries[key] = (mtime, entry)
+        else:
+            self.entries.pop(key, None)
+        return entry
+
+    def rescan(self) -> dict:
+        """کل پوشه را مرور می‌کند؛ فایل‌های حذف‌شده از ایندکس بیرون می‌روند."""
+        with self.lock:
+            seen = set()
+            before = dict(self.entries)
+            for filepath in sorted(self.root.rglob("*.mdx")):
+                seen.add(str(filepath))
+                self.load(filepath)
+            for key in set(self.entries) - seen:
+                del self.entries[key]
+            changed = sum(
+                1 for key, value in self.entries.items() if before.get(key) is not value
+            )
+            return {"files": len(self.entries), "changed": changed}
+
+    def tasks(self) -> list[CoverTask]:
+        with self.lock:
+            return [CoverTask.from_entry(entry) for _, entry in self.entries.values()]
+
+
+# ─────────────────────────────────────────────────────
+# سرور
+# ─────────────────────────────────────────────────────
+class CoverHandler(socketserver.StreamRequestHandler):
+    """هر خط یک درخواست JSON؛ هر پاسخ هم یک خط JSON."""
+
+    def handle(self):
+        for raw in self.rfile:
+            started = time.perf_counter()
+            try:
+                request = json.loads(raw)
+                response = self.server.dispatch(request)
+                response["ok"] = True
+            except Exception as e:
+                response = {"ok": False, "error": f"{type(e).__name__}: {e}"}
+            response["ms"] = round((time.perf_counter() - started) * 1000, 2)
+            self.wfile.write((json.dumps(response, ensure_ascii=False) + "\n").encode("utf-8"))
+            self.wfile.flush()
+            if response.get("stopping"):
+                # پاسخ فرستاده شد — حالا سرور را ببند
+                threading.Thread(target=self.server.shutdown, daemon=True).start()
+                return
+
+
+class CoverServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, socket_path: str, root: Path, output_dir: Path, tasks_dir: Path):
+        self.index = FrontmatterIndex(root)
+        self.output_dir = output_dir
+        self.tasks_dir = tasks_dir
+        # socket فقط برای همین کاربر: دستور cover هر فایلی را می‌خواند و می‌نویسد
+        previous = os.umask(0o177)
+        try:
+            super().__init__(socket_path, CoverHandler)
+        finally:
+            os.umask(previous)
+        os.chmod(socket_path, 0o600)
+
+    def dispatch(self, request: dict) -> dict:
+        cmd = request.get("cmd")
+
+        if cmd == "ping":
+            return {"pid": os.getpid(), "files": len(self.index.entries)}
+
+        if cmd == "rescan":
+            stats = self.index.rescan()
+            self.tasks_dir.mkdir(parents=True, exist_ok=True)
+            tasks = self.index.tasks()
+            assign_cover_keys(tasks)  # همان cover_keyهایی که getData.py می‌نویسد
+            save_json(tasks, str(self.tasks_dir / "cover-tasks.json"))
+            return stats
+
+        if cmd == "cover":
+            filepath = Path(request["file"]).resolve()
+            with self.index.lock:
+                entry = self.index.load(filepath)
+            if not entry:
+                raise ValueError(f"فرانت‌متر معتبر پیدا نشد: {filepath}")
+            task = CoverTask.from_entry(entry)
+            self.output_dir.mkdir(parents=True, exist_ok=True)
+            paths = write_cover(task, self.output_dir, png=request.get("png", False))
+            return {
+                "slug": task["slug"],
+                "theme": detect_theme(task).name,
+                "files": [str(p) for p in paths],
+            }
+
+        if cmd == "shutdown":
+            return {"stopping": True}
+
+        raise ValueError(f"دستور ناشناخته: {cmd}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="سرویس ماندگار تولید کاور")
+    parser.add_argument("directory", help="مسیر پوشه حاوی فایل‌های MDX")
+    parser.add_argument("--socket", default=SOCKET_PATH, help=f"مسیر socket (پیش‌فرض: {SOCKET_PATH})")
+    parser.add_argument("-o", "--output-dir", default="./generated-covers", help="پوشه خروجی کاورها")
+    parser.add_argument("-t", "--tasks-dir", default="./cover-tasks", help="پوشه cover-tasks.json")
+    args = parser.parse_args()
+
+    if os.path.lexists(args.socket):
+        if not stat.S_ISSOCK(os.lstat(args.socket).st_mode):
+            print(f"❌ {args.socket} وجود دارد و socket نیست")
+            return 1
+        try:
+            info = request({"cmd": "ping"}, args.socket, timeout=2.0)
+        except (ConnectionRefusedError, FileNotFoundError):
+            os.unlink(args.socket)  # socket جامانده از daemon قبلی
+        except OSError as e:
+            print(f"❌ {args.socket} پاسخ نمی‌دهد ({e}) — اگر daemon قبلی مرده، socket را دستی پاک کن")
+            return 1
+        else:
+            print(f"❌ daemon دیگری روی {args.socket} در حال اجراست (pid {info.get('pid')})")
+            return 1
+
+    server = CoverServer(
+        args.socket, Path(args.directory).resolve(),
+        Path(args.output_dir), Path(args.tasks_dir),
+    )
+    stats = server.index.rescan()
+    print(f"🟢 daemon آماده: {args.socket} — {stats['files']} فایل MDX در ایندکس", flush=True)
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        if os.path.exists(args.socket):
+            os.unlink(args.socket)
+        print("🔴 daemon متوقف شد")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,287 @@
+#!/usr/bin/env python3
+"""
+Cover Store — انبار محتوا-محور کاورها
+هر تصویر یک بار با کلید هش پرامپت ذخیره می‌شود و برای هر slug لینک می‌شود
+"""
+
+import os
+import re
+import json
+import shutil
+import hashlib
+import argparse
+import unicodedata
+from pathlib import Path
+
+
+# ─────────────────────────────────────────────────────
+# تنظیمات
+# ─────────────────────────────────────────────────────
+# با تغییر قالب پرامپت یا مولد تصویر این عدد را بالا ببر تا کلیدها عوض شوند
+GENERATOR_VERSION = "1"
+STORE_DIR = Path("./cover-store")
+INDEX_NAME = "index.json"
+
+WHITESPACE_PATTERN = re.compile(r"\s+")
+# بخش زبان در مسیر: src/content/articles/fa/x.mdx ↔ src/content/articles/en/x.mdx
+LANG_SEGMENT_PATTERN = re.compile(r"[\\/](fa|en)(?=[\\/])")
+
+
+# ─────────────────────────────────────────────────────
+# 1. کلیدها
+# ─────────────────────────────────────────────────────
+def normalize_prompt(prompt: str) -> str:
+    """پرامپت را یکدست می‌کند تا تفاوت‌های ظاهری کلید را عوض نکنند."""
+    text = unicodedata.normalize("NFKC", prompt or "")
+    text = text.replace("\u200c", " ")  # نیم‌فاصله
+    return WHITESPACE_PATTERN.sub(" ", text).strip().casefold()
+
+
+def prompt_key(prompt: str, version: str = GENERATOR_VERSION) -> str:
+    """کلید محتوا-محور: هش پرامپت نرمال‌شده به‌همراه نسخه مولد."""
+    payload = f"v{version}\n{normalize_prompt(prompt)}".encode("utf-8")
+    return hashlib.sha256(payload).hexdigest()[:32]
+
+
+def translation_group(task: dict) -> str:
+    """شناسه گروه ترجمه — فایل‌های fa/en هم‌مسیر یک گروه‌اند."""
+    source = task.get("source_file", "")
+    if source:
+        return LANG_SEGMENT_PATTERN.sub("/*", source.replace("\\", "/")).lower()
+    return task.get("slug", "").lower()
+
+
+def assign_cover_keys(tasks: list[dict]) -> dict[str, list[dict]]:
+    """
+    به هر تسک `cover_key` می‌دهد و تسک‌ها را بر اساس کلید گروه‌بندی می‌کند.
+    اعضای یک گروه ترجمه کلید پرامپت انگلیسی (یا اولین عضو) را به ارث می‌برند.
+    اولین تسک هر کلید همان تسک مرجعی است که کلید از پرامپتش ساخته شده.
+    """
+    groups: dict[str, list[dict]] = {}
+    for task in tasks:
+        groups.setdefault(translation_group(task), []).append(task)
+
+    by_key: dict[str, list[dict]] = {}
+    for members in groups.values():
+        canonical = next(
+            (t for t in members if t.get("lang") == "en"),
+            min(members, key=lambda t: t.get("source_file", "")),
+        )
+        key = prompt_key(canonical.get("image_prompt", ""))
+        for task in [canonical] + [t for t in members if t is not canonical]:
+            task["cover_key"] = key
+            by_key.setdefault(key, []).append(task)
+
+    return by_key
+
+
+def filename_owners(by_key: dict[str, list[dict]]) -> dict[str, set[str]]:
+    """
+    نام فایل خروجی → کلیدهایی که از آن استفاده می‌کنند.
+    نام فقط از slug ساخته می‌شود، پس Archive/x و articles/fa/x با پرامپت‌های
+    متفاوت روی یک نام می‌افتند؛ این نام‌ها نه برای تولید امن‌اند نه برای لینک.
+    """
+    owners: dict[str, set[str]] = {}
+    for key, members in by_key.items():
+        for task in members:
+            owners.setdefault(task["output_filename"], set()).add(key)
+    return owners
+
+
+def batch_filename(key: str, members: list[dict], owners: dict[str, set[str]]) -> str:
+    """نامی که تصویر این کلید با آن تولید می‌شود؛ اگر نام مشترک است پسوند کلید می‌گیرد."""
+    name = members[0]["output_filename"]
+    if len(owners.get(name, ())) > 1:
+        stem, ext = os.path.splitext(name)
+        name = f"{stem}-{key[:8]}{ext}"
+    return name
+
+
+# ─────────────────────────────────────────────────────
+# 2. انبار
+# ─────────────────────────────────────────────────────
+class CoverStore:
+    """انبار کاورها: objects/<xx>/<key>.png + index.json"""
+
+    def __init__(self, root: str | Path = STORE_DIR):
+        self.root = Path(root)
+        self.objects = self.root / "objects"
+        self.index_path = self.root / INDEX_NAME
+        self.index: dict[str, dict] = {}
+        if self.index_path.exists():
+            with open(self.index_path, "r", encoding="utf-8") as f:
+                self.index = json.load(f)
+
+    def object_path(self, key: str, suffix: str = ".png") -> Path:
+        return self.objects / key[:2] / f"{key}{suffix}"
+
+    def has(self, key: str) -> bool:
+        entry = self.index.get(key)
+        return bool(entry) and (self.root / entry["object"]).exists()
+
+    def put(self, key: str, source: str | Path, slugs: list[str] = ()) -> Path:
+        """یک تصویر تولیدشده را زیر کلیدش ذخیره می‌کند (اگر نبود)."""
+        source = Path(source)
+        target = self.object_path(key, source.suffix or ".png")
+        if not target.exists():
+            target.parent.mkdir(parents=True, exist_ok=True)
+            tmp = target.with_suffix(target.suffix + ".tmp")
+            shutil.copyfile(source, tmp)
+            os.replace(tmp, target)
+
+        entry = self.index.setdefault(key, {"object": "", "slugs": []})
+        entry["object"] = target.relative_to(self.root).as_posix()
+        entry["slugs"] = sorted(set(entry["slugs"]) | set(slugs))
+        return target
+
+    def link(self, key: str, dest: str | Path) -> bool:
+        """تصویر ذخیره‌شده را در مسیر مقصد hardlink (یا در صورت عدم امکان کپی) می‌کند."""
+        if not self.has(key):
+            return False
+        source = self.root / self.index[key]["object"]
+        dest = Path(dest)
+        dest.parent.mkdir(parents=True, exist_ok=True)
+
+        if dest.exists():
+            if os.path.samefile(source, dest):
+                return True
+            dest.unlink()
+        try:
+            os.link(source, dest)
+        except OSError:
+            shutil.copyfile(source, dest)
+        return True
+
+    def evict_orphans(self, live_keys: set[str]) -> list[str]:
+        """کلیدهایی که دیگر هیچ تسکی به آن‌ها اشاره نمی‌کند را پاک می‌کند."""
+        evicted = []
+        for key in list(self.index):
+            if key in live_keys:
+                continue
+            path = self.root / self.index.pop(key)["object"]
+            if path.exists():
+                path.unlink()
+            evicted.append(key)
+
+        # فایل‌هایی که در ایندکس نیستند (مثلاً از اجرای ناتمام)
+        known = {entry["object"] for entry in self.index.values()}
+        if self.objects.exists():
+            for path in self.objects.rglob("*"):
+                if path.is_file() and path.relative_to(self.root).as_posix() not in known:
+                    path.unlink()
+        return evicted
+
+    def save(self):
+        self.root.mkdir(parents=True, exist_ok=True)
+        tmp = self.index_path.with_suffix(".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self.index, f, ensure_ascii=False, indent=2, sort_keys=True)
+        os.replace(tmp, self.index_path)
+
+
+# ─────────────────────────────────────────────────────
+# 3. عملیات دسته‌ای
+# ─────────────────────────────────────────────────────
+def ingest(store: CoverStore, by_key: dict[str, list[dict]], images_dir: Path) -> int:
+    """
+    تصاویر تولیدشده در images_dir را وارد انبار می‌کند (اولین تصویر موجود هر کلید).
+    نام‌های مشترک بین چند کلید نادیده گرفته می‌شوند تا تصویر یک پرامپت زیر کلید دیگری نرود.
+    """
+    owners = filename_owners(by_key)
+    added = 0
+    for key, members in by_key.items():
+        if store.has(key):
+            continue
+        names = [batch_filename(key, members, owners)] + [
+            t["output_filename"] for t in members if len(owners[t["output_filename"]]) == 1
+        ]
+        for name in dict.fromkeys(names):
+            candidate = images_dir / name
+            if candidate.exists():
+                store.put(key, candidate, [t["slug"] for t in members])
+                added += 1
+                break
+    return added
+
+
+def materialize(
+    store: CoverStore, by_key: dict[str, list[dict]], images_dir: Path,
+) -> tuple[int, list[dict], dict[str, set[str]]]:
+    """
+    برای همه slugها از انبار لینک می‌سازد؛ تسک‌های بدون تصویر و نام‌های مشترک
+    (که لینکشان یکی‌یکی روی هم نوشته می‌شد) را برمی‌گرداند.
+    """
+    owners = filename_owners(by_key)
+    conflicts = {name: keys for name, keys in owners.items() if len(keys) > 1}
+    linked = 0
+    missing = []
+    for key, members in by_key.items():
+        if not store.has(key):
+            missing.append(members[0])
+            continue
+        for task in members:
+            if task["output_filename"] in conflicts:
+                continue
+            store.link(key, images_dir / task["output_filename"])
+            linked += 1
+    return linked, missing, conflicts
+
+
+def report_conflicts(conflicts: dict[str, set[str]], by_key: dict[str, list[dict]]):
+    for name, keys in sorted(conflicts.items()):
+        sources = [
+            t.get("source_file", t["slug"])
+            for key in sorted(keys) for t in by_key[key] if t["output_filename"] == name
+        ]
+        print(f"  ⚠️  {name} ← {len(keys)} کاور متفاوت: {', '.join(sources)}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="انبار محتوا-محور کاورها")
+    parser.add_argument("input_json", help="مسیر فایل cover-tasks.json")
+    parser.add_argument(
+        "command",
+        choices=["plan", "ingest", "link", "gc"],
+        help="plan: آمار تکرار | ingest: ورود تصاویر | link: ساخت لینک‌ها | gc: حذف یتیم‌ها",
+    )
+    parser.add_argument("-s", "--store", default=str(STORE_DIR), help="پوشه انبار")
+    parser.add_argument("-i", "--images-dir", default="./generated-covers", help="پوشه تصاویر")
+    args = parser.parse_args()
+
+    with open(args.input_json, "r", encoding="utf-8") as f:
+        tasks = json.load(f)
+
+    by_key = assign_cover_keys(tasks)
+    store = CoverStore(args.store)
+    images_dir = Path(args.images_dir)
+
+    if args.command == "plan":
+        pending = [k for k in by_key if not store.has(k)]
+        print(f"📊 تسک‌ها: {len(tasks)} | کلید یکتا: {len(by_key)} | نیاز به تولید: {len(pending)}")
+        for key in pending:
+            slugs = ", ".join(t["slug"] for t in by_key[key])
+            print(f"  🎨 {key[:12]}  {slugs}")
+        conflicts = {n: k for n, k in filename_owners(by_key).items() if len(k) > 1}
+        if conflicts:
+            print(f"\n⚠️  {len(conflicts)} نام فایل بین چند کاور مشترک است (با پسوند کلید تولید می‌شوند):")
+            report_conflicts(conflicts, by_key)
+        return
+
+    if args.command == "ingest":
+        added = ingest(store, by_key, images_dir)
+        print(f"📥 {added} تصویر وارد انبار شد")
+    elif args.command == "link":
+        linked, missing, conflicts = materialize(store, by_key, images_dir)
+        print(f"🔗 {linked} لینک ساخته شد — {len(missing)} کلید بدون تصویر")
+        if conflicts:
+            print(f"⚠️  {len(conflicts)} نام مشترک لینک نشد — slug یکی از این فایل‌ها را عوض کن:")
+            report_conflicts(conflicts, by_key)
+    else:
+        evicted = store.evict_orphans(set(by_key))
+        print(f"🧹 {len(evicted)} مدخل یتیم حذف شد")
+
+    store.save()
+
+
+if __name__ == "__main__":
+    main()
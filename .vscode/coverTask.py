@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Cover Task — رکورد فشرده تسک کاور
+فیلدها با __slots__ نگه داشته می‌شوند، تگ/دسته/زبان intern می‌شوند
+و پرامپت‌ها فقط هنگام نیاز ساخته می‌شوند
+"""
+
+import sys
+from dataclasses import dataclass
+
+FIELD_ORDER = [
+    "slug", "output_filename", "title", "description", "lang", "tags",
+    "categories", "image_prompt", "agent_instruction_fa", "source_file",
+]
+# فیلدهای اختیاری که فقط وقتی مقدار دارند در JSON می‌آیند (کلید انبار و مدخل‌های batch)
+EXTRA_FIELDS = ["cover_key", "save_as", "aliases"]
+
+
+def _intern_list(value) -> tuple | str:
+    """لیست رشته‌ها → tuple رشته‌های intern‌شده؛ مقدار غیر لیستی دست‌نخورده می‌ماند."""
+    if isinstance(value, (list, tuple)):
+        return tuple(sys.intern(str(v)) for v in value)
+    return value
+
+
+def _join(value) -> str:
+    if isinstance(value, (list, tuple)):
+        return ", ".join(value)
+    return str(value)
+
+
+@dataclass(slots=True)
+class CoverTask:
+    slug: str = "untitled"
+    title: str = "Untitled"
+    description: str = ""
+    lang: str = "en"
+    tags: tuple | str = ()
+    categories: tuple | str = ()
+    source_file: str = ""
+    cover_key: str = ""
+    save_as: str = ""
+    aliases: tuple = ()
+
+    # ─────────────────────────────────────────
+    # ساخت
+    # ─────────────────────────────────────────
+    @classmethod
+    def from_entry(cls, entry: dict) -> "CoverTask":
+        """از خروجی extract_frontmatter یک رکورد می‌سازد."""
+        return cls(
+            slug=entry.get("slug", "untitled"),
+            title=entry.get("title", "Untitled"),
+            description=entry.get("description", ""),
+            lang=sys.intern(str(entry.get("lang", "en"))),
+            tags=_intern_list(entry.get("tags", [])),
+            categories=_intern_list(entry.get("categories", [])),
+            source_file=entry.get("_source_file", ""),
+        )
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "CoverTask":
+        """از یک تسک JSON (cover-tasks.json) رکورد می‌سازد؛ پرامپت‌ها دوباره ساخته می‌شوند."""
+        return cls(
+            slug=data.get("slug", "untitled"),
+            title=data.get("title", "Untitled"),
+            description=data.get("description", ""),
+            lang=sys.intern(str(data.get("lang", "en"))),
+            tags=_intern_list(data.get("tags", [])),
+            categories=_intern_list(data.get("categories", [])),
+            source_file=data.get("source_file", ""),
+            cover_key=data.get("cover_key", ""),
+        )
+
+    # ─────────────────────────────────────────
+    # فیلدهای محاسباتی (lazy)
+    # ─────────────────────────────────────────
+    @property
+    def output_filename(self) -> str:
+        return f"{self.slug}-cover.png"
+
+    @property
+    def image_prompt(self) -> str:
+        """پرامپت انگلیسی برای تولید تصویر."""
+        return (
+            f"Create a professional, modern book/article cover image. "
+            f"Title: \"{self.title}\". "
+            f"Description: \"{self.description}\". "
+            f"Theme keywords: {_join(self.tags)}. "
+            f"Category: {_join(self.categories)}. "
+            f"Style: Clean, elegant, minimalist with subtle gradients. "
+            f"Use symbolic imagery related to the topic. "
+            f"Do NOT include any text or letters in the image. "
+            f"Aspect ratio: 16:9, high quality, editorial style."
+        )
+
+    @property
+    def agent_instruction_fa(self) -> str:
+        """پرامپت فارسی برای ایجنت."""
+        return (
+            f"🎨 ساخت کاور برای مقاله‌ی «{self.title}»\n"
+            f"📄 توضیح: {self.description}\n"
+            f"🏷️  تگ‌ها: {_join(self.tags)}\n"
+            f"📂 دسته‌بندی: {_join(self.categories)}\n"
+            f"🌐 زبان: {self.lang}\n"
+            f"💾 نام فایل خروجی: {self.output_filename}\n"
+            f"🖼️  ابعاد: 1920×1080 (16:9)\n"
+        )
+
+    # ─────────────────────────────────────────
+    # سازگاری با dict / JSON
+    # ─────────────────────────────────────────
+    def get(self, key: str, default=None):
+        """دسترسی شبیه dict تا توابع svgGenerator بدون تغییر کار کنند."""
+        value = getattr(self, key, default)
+        if key in ("tags", "categories") and isinstance(value, tuple):
+            return list(value)
+        return value
+
+    def __getitem__(self, key: str):
+        if key not in FIELD_ORDER and key not in EXTRA_FIELDS:
+            raise KeyError(key)
+        return self.get(key)
+
+    def __setitem__(self, key: str, value):
+        """فقط فیلدهای اختیاری (مثلاً cover_key از assign_cover_keys) قابل نوشتن‌اند."""
+        if key not in EXTRA_FIELDS:
+            raise KeyError(key)
+        setattr(self, key, tuple(value) if key == "aliases" else value)
+
+    def to_dict(self) -> dict:
+        """همان ساختار قدیمی build_cover_prompt — قابل ذخیره در JSON."""
+        data = {field: self.get(field) for field in FIELD_ORDER}
+        for field in EXTRA_FIELDS:
+            value = getattr(self, field)
+            if value:
+                data[field] = list(value) if isinstance(value, tuple) else value
+        return data
@@ -8,9 +8,16 @@ import os
 import re
 import yaml
 import json
+import shutil
+import hashlib
 import argparse
 from pathlib import Path
 from datetime import datetime
+from dataclasses import replace
+from concurrent.futures import ThreadPoolExecutor
+
+from coverStore import CoverStore, assign_cover_keys, batch_filename, filename_owners
+from coverTask import CoverTask
 
 
 # ─────────────────────────────────────────────
@@ -91,69 +98,30 @@ def scan_mdx_files(root_dir: str) -> list[dict]:
 # ─────────────────────────────────────────────
 def build_cover_prompt(entry: dict) -> dict:
     """برای هر مقاله یک پرامپت تولید تصویر کاور می‌سازد."""
-
-    title = entry.get("title", "Untitled")
-    description = entry.get("description", "")
-    lang = entry.get("lang", "en")
-    tags = entry.get("tags", [])
-    categories = entry.get("categories", [])
-    slug = entry.get("slug", "untitled")
-
-    if isinstance(tags, list):
-        tags_str = ", ".join(tags)
-    else:
-        tags_str = str(tags)
-
-    if isinstance(categories, list):
-        cats_str = ", ".join(categories)
-    else:
-        cats_str = str(categories)
-
-    # پرامپت انگلیسی برای تولید تصویر
-    image_prompt = (
-        f"Create a professional, modern book/article cover image. "
-        f"Title: \"{title}\". "
-        f"Description: \"{description}\". "
-        f"Theme keywords: {tags_str}. "
-        f"Category: {cats_str}. "
-        f"Style: Clean, elegant, minimalist with subtle gradients. "
-        f"Use symbolic imagery related to the topic. "
-        f"Do NOT include any text or letters in the image. "
-        f"Aspect ratio: 16:9, high quality, editorial style."
-    )
-
-    # پرامپت فارسی برای ایجنت
-    agent_instruction = (
-        f"🎨 ساخت کاور برای مقاله‌ی «{title}»\n"
-        f"📄 توضیح: {description}\n"
-        f"🏷️  تگ‌ها: {tags_str}\n"
-        f"📂 دسته‌بندی: {cats_str}\n"
-        f"🌐 زبان: {lang}\n"
-        f"💾 نام فایل خروجی: {slug}-cover.png\n"
-        f"🖼️  ابعاد: 1920×1080 (16:9)\n"
-    )
-
-    return {
-        "slug": slug,
-        "output_filename": f"{slug}-cover.png",
-        "title": title,
-        "description": description,
-        "lang": lang,
-        "tags": tags,
-        "categories": categories,
-        "image_prompt": image_prompt,
-        "agent_instruction_fa": agent_instruction,
-        "source_file": entry.get("_source_file", ""),
-    }
+    return CoverTask.from_entry(entry).to_dict()
 
 
 # ─────────────────────────────────────────────
 # 4. خروجی‌ها: JSON + Markdown + Agent Batch
 # ─────────────────────────────────────────────
-def save_json(tasks: list[dict], output_path: str):
-    """ذخیره به‌صورت JSON."""
+def _as_dict(task: CoverTask | dict) -> dict:
+    return task.to_dict() if isinstance(task, CoverTask) else task
+
+
+def save_json(tasks: list[CoverTask | dict], output_path: str):
+    """
+    ذخیره به‌صورت JSON — تسک‌ها یکی‌یکی سریال می‌شوند تا پرامپت‌های همه با هم
+    در حافظه نباشند (خروجی بایت‌به‌بایت همان json.dump(..., indent=2) است).
+    """
     with open(output_path, "w", encoding="utf-8") as f:
-        json.dump(tasks, f, ensure_ascii=False, indent=2)
+        if not tasks:
+            f.write("[]")
+        for i, task in enumerate(tasks):
+            item = json.dumps(_as_dict(task), ensure_ascii=False, indent=2)
+            f.write("[\n  " if i == 0 else ",\n  ")
+            f.write(item.replace("\n", "\n  "))
+        if tasks:
+            f.write("\n]")
     print(f"\n💾 JSON ذخیره شد: {output_path}")
 
 
@@ -208,14 +176,129 @@ def save_agent_batch(tasks: list[dict], output_path: str):
         lines.append(f"{task['image_prompt']}\n\n")
         lines.append(f"⚙️  Action:\n")
         lines.append(f"  1. Use NanoBanana to generate image with the above prompt\n")
-        lines.append(f"  2. Save as: {task['output_filename']}\n")
-        lines.append(f"  3. Resolution: 1920x1080\n\n")
+        save_as = task.get("save_as") or task["output_filename"]
+        lines.append(f"  2. Save as: {save_as}\n")
+        if save_as != task["output_filename"]:
+            lines.append(f"     ({task['output_filename']} is shared by covers with different prompts)\n")
+        lines.append(f"  3. Resolution: 1920x1080\n")
+        if task.get("aliases"):
+            lines.append(f"  4. Reused by (no need to generate): {', '.join(task['aliases'])}\n")
+        lines.append("\n")
 
     with open(output_path, "w", encoding="utf-8") as f:
         f.writelines(lines)
     print(f"🤖 فایل دستور ایجنت ذخیره شد: {output_path}")
 
 
+# ─────────────────────────────────────────────
+# 4b. خروجی تکه‌تکه (shard) — بر اساس زبان، مجموعه یا اندازه
+# ─────────────────────────────────────────────
+SHARD_INDEX = "index.json"
+
+
+def task_collection(task: dict) -> str:
+    """مجموعه محتوا (articles, books, wiki, ...) از مسیر فایل مبدا."""
+    parts = task.get("source_file", "").replace("\\", "/").split("/")
+    if "content" in parts[:-1]:
+        rest = parts[parts.index("content") + 1:]
+        if len(rest) > 1:
+            return rest[0].lower()
+    return "misc"
+
+
+def shard_tasks(tasks: list[dict], by: str, size: int = 50) -> dict[str, list[dict]]:
+    """تسک‌ها را به shardهای نام‌دار تقسیم می‌کند (ترتیب اصلی حفظ می‌شود)."""
+    if by == "size":
+        return {
+            f"part-{i // size + 1:03d}": tasks[i:i + size]
+            for i in range(0, len(tasks), size)
+        }
+
+    key = (lambda t: f"lang-{t.get('lang', 'en')}") if by == "lang" else task_collection
+    shards: dict[str, list[dict]] = {}
+    for task in tasks:
+        shards.setdefault(key(task), []).append(task)
+    return shards
+
+
+def _shard_hash(tasks: list[dict], batch: list[dict]) -> str:
+    payload = json.dumps(
+        [[_as_dict(t) for t in tasks], [_as_dict(t) for t in batch]],
+        ensure_ascii=False, sort_keys=True,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+
+def save_sharded(tasks: list[dict], batch: list[dict], out_dir: Path, by: str, size: int = 50, workers: int = 4):
+    """
+    هر shard در پوشه‌ی خودش cover-tasks.md و agent-batch.txt می‌گیرد.
+    فقط shardهایی که تسک‌هایشان تغییر کرده دوباره نوشته می‌شوند (موازی)،
+    و index.json فهرست همه shardها را نگه می‌دارد.
+    """
+    shard_dir = out_dir / "shards"
+    shard_dir.mkdir(parents=True, exist_ok=True)
+    index_path = shard_dir / SHARD_INDEX
+    previous = {}
+    if index_path.exists():
+        with open(index_path, "r", encoding="utf-8") as f:
+            previous = json.load(f).get("shards", {})
+
+    # batch هم با همان کلید تقسیم می‌شود؛ در حالت size هر تسک batch همراه فایل مبدا خودش می‌رود
+    # (slug بین fa/en و Archive تکرار می‌شود، source_file نه)
+    task_shards = shard_tasks(tasks, by, size)
+    if by == "size":
+        owner = {t["source_file"]: name for name, members in task_shards.items() for t in members}
+        batch_shards: dict[str, list[dict]] = {}
+        for task in batch:
+            batch_shards.setdefault(owner.get(task["source_file"], "part-001"), []).append(task)
+    else:
+        batch_shards = shard_tasks(batch, by, size)
+
+    index = {}
+    pending = []
+    for name, members in task_shards.items():
+        members_batch = batch_shards.get(name, [])
+        digest = _shard_hash(members, members_batch)
+        path = shard_dir / name
+        index[name] = {
+            "tasks": len(members),
+            "batch": len(members_batch),
+            "hash": digest,
+            "files": [f"{name}/cover-tasks.md", f"{name}/agent-batch.txt"],
+        }
+        unchanged = (
+            previous.get(name, {}).get("hash") == digest
+            and all((shard_dir / f).exists() for f in index[name]["files"])
+        )
+        if not unchanged:
+            pending.append((path, members, members_batch))
+
+    def write(job):
+        path, members, members_batch = job
+        path.mkdir(parents=True, exist_ok=True)
+        save_markdown_report(members, str(path / "cover-tasks.md"))
+        save_agent_batch(members_batch, str(path / "agent-batch.txt"))
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        list(pool.map(write, pending))
+
+    # shardهای قدیمی که دیگر وجود ندارند
+    for name in set(previous) - set(index):
+        shutil.rmtree(shard_dir / name, ignore_errors=True)
+
+    tmp = index_path.with_suffix(".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump({
+            "generated": datetime.now().strftime("%Y-%m-%d %H:%M"),
+            "shard_by": by,
+            "shards": index,
+        }, f, ensure_ascii=False, indent=2)
+    os.replace(tmp, index_path)
+
+    print(f"🧩 {len(index)} shard — {len(pending)} بازنویسی شد، "
+          f"{len(index) - len(pending)} بدون تغییر: {index_path}")
+
+
 # ─────────────────────────────────────────────
 # 5. اجرا
 # ─────────────────────────────────────────────
@@ -232,6 +315,23 @@ def main():
         default="./cover-tasks",
         help="پوشه خروجی (پیش‌فرض: ./cover-tasks)",
     )
+    parser.add_argument(
+        "-s", "--store",
+        default=None,
+        help="پوشه انبار کاور — تسک‌هایی که تصویرشان موجود است از batch حذف می‌شوند",
+    )
+    parser.add_argument(
+        "--shard-by",
+        choices=["none", "lang", "collection", "size"],
+        default="none",
+        help="تقسیم گزارش و batch به چند فایل (پیش‌فرض: none = یک فایل)",
+    )
+    parser.add_argument(
+        "--shard-size",
+        type=int,
+        default=50,
+        help="تعداد تسک در هر shard برای --shard-by size",
+    )
     args = parser.parse_args()
 
     # اسکن و استخراج
@@ -240,26 +340,63 @@ def main():
         print("\n❌ هیچ فایل MDX معتبری پیدا نشد!")
         return
 
-    # ساخت تسک‌ها
-    tasks = [build_cover_prompt(entry) for entry in entries]
+    # ساخت تسک‌ها — رکوردهای فشرده؛ پرامپت‌ها فقط هنگام نوشتن خروجی ساخته می‌شوند
+    tasks = [CoverTask.from_entry(entry) for entry in entries]
+    del entries  # دیکشنری‌های فرانت‌متر دیگر لازم نیستند
     print(f"\n✅ {len(tasks)} تسک کاور ساخته شد\n")
 
+    # تسک‌های هم‌پرامپت / ترجمه‌ای فقط یک بار تولید می‌شوند
+    by_key = assign_cover_keys(tasks)
+    store = CoverStore(args.store) if args.store else None
+    owners = filename_owners(by_key)
+    # members[0] تسک مرجع است: پرامپتش همان است که کلید از آن ساخته شده
+    batch = [
+        replace(
+            members[0],
+            save_as=batch_filename(key, members, owners),
+            aliases=tuple(
+                name for name in dict.fromkeys(t["output_filename"] for t in members[1:])
+                if name != members[0]["output_filename"] and len(owners[name]) == 1
+            ),
+        )
+        for key, members in by_key.items()
+        if not (store and store.has(key))
+    ]
+    print(f"♻️  کلید یکتا: {len(by_key)} | نیاز به تولید: {len(batch)}\n")
+    shared = sorted(name for name, keys in owners.items() if len(keys) > 1)
+    if shared:
+        print(f"⚠️  {len(shared)} نام فایل بین چند کاور متفاوت مشترک است — در batch با پسوند کلید ذخیره می‌شوند:")
+        for name in shared:
+            print(f"     {name}")
+        print()
+
     # ذخیره خروجی‌ها
     out_dir = Path(args.output_dir)
     out_dir.mkdir(parents=True, exist_ok=True)
 
     save_json(tasks, str(out_dir / "cover-tasks.json"))
-    save_markdown_report(tasks, str(out_dir / "cover-tasks.md"))
-    save_agent_batch(tasks, str(out_dir / "agent-batch.txt"))
+    # خروجی چیدمان دیگر (تک‌فایل ↔ shard) از اجرای قبلی پاک می‌شود تا دو نسخه‌ی ناهمسان نماند
+    if args.shard_by == "none":
+        shutil.rmtree(out_dir / "shards", ignore_errors=True)
+        save_markdown_report(tasks, str(out_dir / "cover-tasks.md"))
+        save_agent_batch(batch, str(out_dir / "agent-batch.txt"))
+    else:
+        for stale in ("cover-tasks.md", "agent-batch.txt"):
+            (out_dir / stale).unlink(missing_ok=True)
+        save_sharded(tasks, batch, out_dir, args.shard_by, args.shard_size)
 
     # نمایش خلاصه
     print(f"\n{'─'*50}")
     print(f"📊 خلاصه:")
     print(f"   فایل‌های MDX پردازش‌شده: {len(tasks)}")
+    print(f"   کاورهای قابل تولید: {len(batch)}")
     print(f"   خروجی‌ها در: {out_dir.resolve()}")
     print(f"   • cover-tasks.json  → برای استفاده برنامه‌نویسی")
-    print(f"   • cover-tasks.md    → گزارش خوانا")
-    print(f"   • agent-batch.txt   → مستقیم بده به ایجنت")
+    if args.shard_by == "none":
+        print(f"   • cover-tasks.md    → گزارش خوانا")
+        print(f"   • agent-batch.txt   → مستقیم بده به ایجنت")
+    else:
+        print(f"   • shards/index.json → فهرست shardها ({args.shard_by})")
     print(f"{'─'*50}\n")
 
 
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Rasterizers — بک‌اندهای قابل تعویض برای تبدیل SVG به PNG
+cairosvg (درون‌پردازه‌ای)، rsvg-convert / resvg (زیرپردازه، موازی) و none (فقط SVG)
+"""
+
+import shutil
+import subprocess
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+
+
+class Rasterizer:
+    """رابط مشترک: to_bytes برای یک SVG، render_many برای یک دسته."""
+
+    name = "base"
+
+    def __init__(self, width: int = 1920, height: int = 1080, jobs: int = 1):
+        self.width = width
+        self.height = height
+        self.jobs = max(1, jobs)
+
+    @classmethod
+    def available(cls) -> bool:
+        return True
+
+    def to_bytes(self, svg_content: str) -> bytes:
+        raise NotImplementedError
+
+    def render(self, svg_content: str, png_path: Path):
+        Path(png_path).write_bytes(self.to_bytes(svg_content))
+
+    def render_many(self, jobs: list[tuple[str, Path]]) -> list[Path]:
+        """یک دسته (svg, مسیر png) را رستر می‌کند."""
+        for svg_content, png_path in jobs:
+            self.render(svg_content, png_path)
+        return [png_path for _, png_path in jobs]
+
+
+class CairoRasterizer(Rasterizer):
+    """cairosvg درون همین پردازه — فقط یک بار import می‌شود."""
+
+    name = "cairosvg"
+    _module = None
+
+    @classmethod
+    def available(cls) -> bool:
+        try:
+            cls._load()
+            return True
+        except (ImportError, OSError):
+            # OSError: cairosvg نصب است ولی کتابخانه‌ی بومی libcairo پیدا نشد
+            return False
+
+    @classmethod
+    def _load(cls):
+        if cls._module is None:
+            import cairosvg
+            cls._module = cairosvg
+        return cls._module
+
+    def to_bytes(self, svg_content: str) -> bytes:
+        return self._load().svg2png(
+            bytestring=svg_content.encode(),
+            output_width=self.width,
+            output_height=self.height,
+        )
+
+    def render(self, svg_content: str, png_path: Path):
+        self._load().svg2png(
+            bytestring=svg_content.encode(),
+            write_to=str(png_path),
+            output_width=self.width,
+            output_height=self.height,
+        )
+
+
+class SubprocessRasterizer(Rasterizer):
+    """
+    ابزار خط فرمان با stdin/stdout — بدون فایل موقت.
+    هیچ‌کدام از این ابزارها چند SVG را در یک اجرا به چند PNG تبدیل نمی‌کنند،
+    پس دسته‌ها با یک استخر از `jobs` پردازه‌ی هم‌زمان اجرا می‌شوند.
+    """
+
+    executable = ""
+
+    @classmethod
+    def available(cls) -> bool:
+        return shutil.which(cls.executable) is not None
+
+    def command(self) -> list[str]:
+        raise NotImplementedError
+
+    def to_bytes(self, svg_content: str) -> bytes:
+        result = subprocess.run(
+            self.command(), input=svg_content.encode(), capture_output=True, check=False,
+        )
+        if result.returncode != 0:
+            raise RuntimeError(f"{self.executable}: {result.stderr.decode(errors='replace').strip()}")
+        return result.stdout
+
+    def render_many(self, jobs: list[tuple[str, Path]]) -> list[Path]:
+        if self.jobs == 1:
+            return super().render_many(jobs)
+        with ThreadPoolExecutor(max_workers=self.jobs) as pool:
+            list(pool.map(lambda job: self.render(*job), jobs))
+        return [png_path for _, png_path in jobs]
+
+
+class RsvgRasterizer(SubprocessRasterizer):
+    name = "rsvg-convert"
+    executable = "rsvg-convert"
+
+    def command(self) -> list[str]:
+        return [self.executable, "-f", "png", "-w", str(self.width), "-h", str(self.height)]
+
+
+class ResvgRasterizer(SubprocessRasterizer):
+    name = "resvg"
+    executable = "resvg"
+
+    def command(self) -> list[str]:
+        return [self.executable, "-w", str(self.width), "-h", str(self.height), "-", "-c"]
+
+
+class NullRasterizer(Rasterizer):
+    """فقط SVG — هیچ PNG ساخته نمی‌شود."""
+
+    name = "none"
+
+    def to_bytes(self, svg_content: str) -> bytes:
+        return b""
+
+    def render(self, svg_content: str, png_path: Path):
+        pass
+
+    def render_many(self, jobs: list[tuple[str, Path]]) -> list[Path]:
+        return []
+
+
+RASTERIZERS = {
+    cls.name: cls
+    for cls in (CairoRasterizer, RsvgRasterizer, ResvgRasterizer, NullRasterizer)
+}
+
+
+def get_rasterizer(name: str, width: int = 1920, height: int = 1080, jobs: int = 1) -> Rasterizer:
+    """بک‌اند را با نام می‌سازد؛ اگر نصب نباشد ImportError می‌دهد."""
+    if name not in RASTERIZERS:
+        raise ValueError(f"rasterizer ناشناخته: {name} (گزینه‌ها: {', '.join(RASTERIZERS)})")
+    cls = RASTERIZERS[name]
+    if not cls.available():
+        raise ImportError(f"{name} در دسترس نیست", name=name)
+    return cls(width, height, jobs)
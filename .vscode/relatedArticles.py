@@ -0,0 +1,384 @@
+#!/usr/bin/env python3
+"""
+Related Articles — پیش‌محاسبه‌ی مطالب مرتبط از فرانت‌متر
+بردارهای اسپارس TF-IDF (عنوان/توضیح) + هم‌پوشانی تگ و دسته‌بندی،
+k همسایه‌ی نزدیک هر slug با ضرب ماتریس اسپارس دسته‌ای — بدون حلقه‌ی O(n²)
+خروجی: یک JSON فشرده که RelatedContent.astro مستقیم می‌خواند
+"""
+
+import re
+import sys
+import math
+import json
+import yaml
+import time
+import heapq
+import argparse
+import unicodedata
+from pathlib import Path
+from datetime import datetime
+from collections import Counter, defaultdict
+
+from getData import FRONTMATTER_PATTERN
+
+# وزن هر بلوک در امتیاز نهایی: score = TEXT·cos(text) + TAGS·cos(tags)
+TEXT_WEIGHT = 0.6
+TAG_WEIGHT = 0.4
+MIN_SCORE = 0.05
+BATCH_SIZE = 512
+# امتیازها پیش از مقایسه گرد می‌شوند تا خطای ممیز شناور ترتیب هم‌امتیازها را عوض نکند
+RANK_DECIMALS = 6
+
+COLLECTIONS_PATTERN = re.compile(r"export\s+const\s+collections\s*=\s*\{([^}]*)\}")
+LANG_PREFIX = re.compile(r"^(fa|en)/")  # مثل stripLangPrefix در src/i18n
+
+
+# ─────────────────────────────────────────────────────
+# 1. نرمال‌سازی فارسی و توکن‌سازی
+# ─────────────────────────────────────────────────────
+PERSIAN_TRANSLATION = str.maketrans({
+    "ي": "ی",  # یای عربی
+    "ى": "ی",  # الف مقصوره
+    "ك": "ک",  # کاف عربی
+    "ة": "ه",
+    "ۀ": "ه",
+    "أ": "ا",
+    "إ": "ا",
+    "ٱ": "ا",
+    "ؤ": "و",
+    "\u200c": " ",  # نیم‌فاصله (ZWNJ)
+    "\u200f": None,  # RLM
+    "\u200e": None,  # LRM
+    "ـ": None,  # کشیده
+    **{chr(0x06F0 + i): str(i) for i in range(10)},  # ارقام فارسی
+    **{chr(0x0660 + i): str(i) for i in range(10)},  # ارقام عربی
+})
+DIACRITICS_PATTERN = re.compile(r"[\u064B-\u065F\u0670]")  # اعراب
+TOKEN_PATTERN = re.compile(r"\w{2,}")
+
+STOPWORDS = set("""
+و در به از که این را با است برای آن یک تا می ها های بر هم نیز شود شده کرد کند
+باید خود اما یا اگر هر چه دیگر بین پس نه بود هست ای ی
+the and of to in a is for on with as by an be this that are from or at it its
+""".split())
+
+
+def normalize_fa(text: str) -> str:
+    """یکسان‌سازی حروف عربی/فارسی، حذف اعراب و کشیده، نیم‌فاصله → فاصله."""
+    text = DIACRITICS_PATTERN.sub("", str(text).translate(PERSIAN_TRANSLATION))
+    return text.casefold()
+
+
+def tokenize(text: str) -> list[str]:
+    return [t for t in TOKEN_PATTERN.findall(normalize_fa(text)) if t not in STOPWORDS]
+
+
+def _as_list(value) -> list[str]:
+    if isinstance(value, list):
+        return [str(v) for v in value]
+    return [str(value)] if value else []
+
+
+# ─────────────────────────────────────────────────────
+# 2. بردارهای اسپارس
+# ─────────────────────────────────────────────────────
+def build_vectors(docs: list[dict]) -> tuple[list[dict[int, float]], int]:
+    """
+    برای هر سند یک بردار اسپارس {feature: weight} می‌سازد.
+    دو بلوک جدا (متن و تگ) هرکدام نرمال می‌شوند و با جذر وزنشان ضرب می‌شوند
+    تا ضرب داخلی دقیقاً TEXT·cos + TAGS·cos شود.
+    """
+    n = len(docs)
+    vocab: dict[str, int] = {}
+    raw_rows = []
+    df = Counter()
+
+    for doc in docs:
+        text = Counter(tokenize(doc["title"]) * 2 + tokenize(doc["description"]))
+        labels = Counter(
+            [f"#{normalize_fa(t).strip()}" for t in doc["tags"]]
+            + [f"@{normalize_fa(c).strip()}" for c in doc["categories"]]
+        )
+        raw_rows.append((text, labels))
+        df.update(set(text) | set(labels))
+
+    # واژه‌هایی که در بیش از نیمی از اسناد هستند تمایزی نمی‌دهند و لیست‌ها را بزرگ می‌کنند
+    max_df = max(2, n // 2) if n > 20 else n
+
+    def block(counts: Counter, weight: float) -> dict[int, float]:
+        vec = {}
+        for term, count in counts.items():
+            if df[term] > max_df:
+                continue
+            idf = math.log((1 + n) / (1 + df[term])) + 1
+            vec[vocab.setdefault(term, len(vocab))] = (1 + math.log(count)) * idf
+        norm = math.sqrt(sum(w * w for w in vec.values()))
+        scale = math.sqrt(weight) / norm if norm else 0
+        return {f: w * scale for f, w in vec.items()}
+
+    rows = []
+    for text, labels in raw_rows:
+        row = block(text, TEXT_WEIGHT)
+        row.update(block(labels, TAG_WEIGHT))
+        rows.append(row)
+    return rows, len(vocab)
+
+
+# ─────────────────────────────────────────────────────
+# 3. k همسایه‌ی نزدیک
+# ─────────────────────────────────────────────────────
+def top_k_scipy(rows: list[dict[int, float]], n_features: int, k: int) -> list[list[tuple[int, float]]]:
+    """ضرب X·Xᵀ به‌صورت دسته‌ای با scipy.sparse."""
+    import numpy as np
+    from scipy import sparse
+
+    indptr, indices, data = [0], [], []
+    for row in rows:
+        indices.extend(row.keys())
+        data.extend(row.values())
+        indptr.append(len(indices))
+    X = sparse.csr_matrix((data, indices, indptr), shape=(len(rows), n_features), dtype=np.float64)
+    XT = X.T.tocsc()
+
+    result = []
+    for start in range(0, len(rows), BATCH_SIZE):
+        S = (X[start:start + BATCH_SIZE] @ XT).tocsr()
+        for local in range(S.shape[0]):
+            doc = start + local
+            lo, hi = S.indptr[local], S.indptr[local + 1]
+            cols, vals = S.indices[lo:hi], S.data[lo:hi]
+            keep = (cols != doc) & (vals >= MIN_SCORE)
+            cols, vals = cols[keep], vals[keep]
+            rank = np.round(vals, RANK_DECIMALS)
+            if len(vals) > k:
+                # همه‌ی هم‌امتیازهای جایگاه k بمانند تا ترتیب با اندیس تعیین شود
+                kth = -np.partition(-rank, k - 1)[k - 1]
+                top = rank >= kth
+                cols, vals, rank = cols[top], vals[top], rank[top]
+            order = np.lexsort((cols, -rank))[:k]
+            result.append([(int(cols[i]), float(vals[i])) for i in order])
+    return result
+
+
+def top_k_postings(rows: list[dict[int, float]], k: int) -> list[list[tuple[int, float]]]:
+    """
+    همان ضرب اسپارس با لیست‌های معکوس (بدون وابستگی) — نتیجه‌ی دقیق، مثل scipy.
+    ویژگی‌ها از کم‌تکرار به پرتکرار پیمایش می‌شوند و postingهایشان کاندید می‌سازند؛
+    وقتی بیشترین امتیازی که ویژگی‌های باقی‌مانده به یک سند تازه می‌دهند
+    به k-امین امتیاز (یا MIN_SCORE) نمی‌رسد، کاندید جدیدی لازم نیست (MaxScore)
+    و باقی ویژگی‌ها فقط امتیاز کاندیدهای موجود را کامل می‌کنند.
+    """
+    postings: dict[int, list[tuple[int, float]]] = defaultdict(list)
+    for doc, row in enumerate(rows):
+        for feature, weight in row.items():
+            postings[feature].append((doc, weight))
+    max_weight = {f: max(w for _, w in plist) for f, plist in postings.items()}
+
+    result = []
+    for doc, row in enumerate(rows):
+        features = sorted(row.items(), key=lambda fw: (len(postings[fw[0]]), fw[0]))
+        # remaining[i] = سقف امتیازی که ویژگی‌های i به بعد به هر سندی می‌دهند
+        remaining = [0.0] * (len(features) + 1)
+        for i in range(len(features) - 1, -1, -1):
+            f, w = features[i]
+            remaining[i] = remaining[i + 1] + w * max_weight[f]
+
+        scores: dict[int, float] = defaultdict(float)
+        cut = len(features)
+        for i, (feature, weight) in enumerate(features):
+            threshold = MIN_SCORE
+            # k-امین امتیاز جزئی هرگز از سقف ویژگی‌های پیموده‌شده بیشتر نیست
+            if len(scores) > k and remaining[i] < remaining[0] - remaining[i]:
+                best = [s for s, o in heapq.nlargest(k + 1, ((s, o) for o, s in scores.items())) if o != doc]
+                threshold = max(threshold, best[k - 1])
+            # حاشیه‌ی گردکردن: سند تازه‌ای که بعد از گردکردن هم‌امتیاز شود هم کنار نرود
+            if remaining[i] < threshold - 10 ** -RANK_DECIMALS:
+                cut = i
+                break
+            for other, other_weight in postings[feature]:
+                scores[other] += weight * other_weight
+
+        scores.pop(doc, None)
+        rest = features[cut:]
+        if rest:
+            # فقط کاندیدهایی کامل می‌شوند که با سقف باقی‌مانده هنوز به k-امین برسند
+            floor = MIN_SCORE
+            if len(scores) > k:
+                floor = max(floor, heapq.nlargest(k, scores.values())[-1])
+            floor -= remaining[cut] + 10 ** -RANK_DECIMALS
+            for other, partial in list(scores.items()):
+                if partial < floor:
+                    del scores[other]
+                    continue
+                other_row = rows[other]
+                scores[other] = partial + sum(w * other_row.get(f, 0.0) for f, w in rest)
+
+        result.append(_ranked([(o, s) for o, s in scores.items() if s >= MIN_SCORE], k))
+    return result
+
+
+def _ranked(hits: list[tuple[int, float]], k: int) -> list[tuple[int, float]]:
+    """k بهترین با ترتیب قطعی: امتیاز گردشده نزولی، سپس اندیس سند."""
+    if len(hits) > k:
+        kth = heapq.nlargest(k, (s for _, s in hits))[-1] - 10 ** -RANK_DECIMALS
+        hits = [hit for hit in hits if hit[1] >= kth]
+    return sorted(hits, key=lambda hit: (-round(hit[1], RANK_DECIMALS), hit[0]))[:k]
+
+
+def compute_related(docs: list[dict], k: int) -> list[list[tuple[int, float]]]:
+    rows, n_features = build_vectors(docs)
+    try:
+        return top_k_scipy(rows, n_features, k)
+    except ImportError:
+        return top_k_postings(rows, k)
+
+
+# ─────────────────────────────────────────────────────
+# 4. اجرا
+# ─────────────────────────────────────────────────────
+def registered_collections(config_path: Path) -> list[str]:
+    """نام مجموعه‌های ثبت‌شده در `export const collections = {...}` (مثلاً Archive ثبت نشده)."""
+    match = COLLECTIONS_PATTERN.search(config_path.read_text(encoding="utf-8"))
+    if not match:
+        raise ValueError(f"collections در {config_path} پیدا نشد")
+    return re.findall(r"\w+", match.group(1))
+
+
+def github_slug(segment: str) -> str:
+    """مثل github-slugger: حروف کوچک، حذف نشانه‌ها و علائم (جز - و _)، فاصله → -"""
+    kept = "".join(
+        ch for ch in segment.lower()
+        if ch in " -" or unicodedata.category(ch)[0] in "LMN" or unicodedata.category(ch) == "Pc"
+    )
+    return kept.replace(" ", "-")
+
+
+def astro_id(path: Path, base: Path, frontmatter: dict) -> str:
+    """همان id که glob loader آسترو می‌سازد: slug فرانت‌متر، وگرنه مسیر slugify‌شده."""
+    if frontmatter.get("slug"):
+        return str(frontmatter["slug"])
+    segments = path.relative_to(base).with_suffix("").parts
+    return re.sub(r"/index$", "", "/".join(github_slug(s) for s in segments))
+
+
+def read_frontmatter(path: Path) -> dict | None:
+    try:
+        match = FRONTMATTER_PATTERN.match(path.read_text(encoding="utf-8"))
+        data = yaml.safe_load(match.group(1)) if match else None
+    except (OSError, UnicodeDecodeError, yaml.YAMLError) as e:
+        print(f"⚠️  {path}: {e}")
+        return None
+    return data if isinstance(data, dict) else None
+
+
+def load_docs(content_dir: Path, collections: list[str]) -> list[dict]:
+    """
+    فرانت‌متر همه مطالب منتشرشده در مجموعه‌های ثبت‌شده.
+    کلید = collection/id بدون پیشوند زبان — همان چیزی که RelatedContent.astro
+    با stripLangPrefix(article.id) می‌سازد.
+    """
+    docs = []
+    for collection in collections:
+        base = content_dir / collection
+        paths = sorted(p for ext in ("*.md", "*.mdx") for p in base.rglob(ext))
+        for path in paths:
+            data = read_frontmatter(path)
+            if not data or data.get("draft"):
+                continue
+            docs.append({
+                "key": f"{collection}/{LANG_PREFIX.sub('', astro_id(path, base, data))}",
+                "collection": collection,
+                "lang": str(data.get("lang", "fa")),
+                "title": str(data.get("title", "")),
+                "description": str(data.get("description", "")),
+                "tags": _as_list(data.get("tags")),
+                "categories": _as_list(data.get("categories")),
+            })
+    return docs
+
+
+def build_artifact(docs: list[dict], k: int) -> dict:
+    """
+    همسایه‌ها فقط در همان زبان و همان مجموعه — هر گروه جداگانه محاسبه می‌شود،
+    تا k جایگاه با مطالبی که صفحه‌ی مقصد نمی‌تواند نشان دهد پر نشود.
+    """
+    groups = defaultdict(list)
+    for doc in docs:
+        groups[doc["lang"], doc["collection"]].append(doc)
+
+    related = defaultdict(dict)
+    for (lang, _), group in sorted(groups.items()):
+        neighbours = compute_related(group, k)
+        related[lang].update({
+            doc["key"]: [[group[j]["key"], round(score, 4)] for j, score in hits]
+            for doc, hits in zip(group, neighbours)
+            if hits
+        })
+
+    return {
+        "generated": datetime.now().strftime("%Y-%m-%dT%H:%M:%S"),
+        "k": k,
+        "related": dict(related),
+    }
+
+
+def check_backends(count: int, k: int) -> int:
+    """خروجی top_k_postings را روی مجموعه‌ی مصنوعی با top_k_scipy مقایسه می‌کند."""
+    from benchTaskMemory import synthetic_entries
+
+    docs = [
+        {
+            "title": e["title"], "description": e["description"],
+            "tags": e["tags"], "categories": e["categories"],
+        }
+        for e in synthetic_entries(count)
+    ]
+    rows, n_features = build_vectors(docs)
+
+    started = time.perf_counter()
+    expected = top_k_scipy(rows, n_features, k)
+    scipy_seconds = time.perf_counter() - started
+    started = time.perf_counter()
+    actual = top_k_postings(rows, k)
+    postings_seconds = time.perf_counter() - started
+
+    def ids(hits):
+        return [(j, round(score, RANK_DECIMALS)) for j, score in hits]
+
+    mismatched = [i for i, (a, b) in enumerate(zip(expected, actual)) if ids(a) != ids(b)]
+    empty = sum(1 for hits in actual if not hits)
+    print(f"🔬 {count} سند | scipy: {scipy_seconds:.2f}s | postings: {postings_seconds:.2f}s"
+          f" | بدون همسایه: {empty} | ناهمسان: {len(mismatched)}")
+    for i in mismatched[:5]:
+        print(f"   #{i}: scipy={ids(expected[i])}\n        postings={ids(actual[i])}")
+    return 1 if mismatched else 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="پیش‌محاسبه مطالب مرتبط")
+    parser.add_argument("directory", nargs="?", default="src/content", help="پوشه محتوا (پیش‌فرض: src/content)")
+    parser.add_argument("-o", "--output", default="src/data/related.json", help="مسیر خروجی JSON")
+    parser.add_argument("-k", type=int, default=6, help="تعداد همسایه برای هر مطلب")
+    parser.add_argument("--config", default="src/content.config.ts", help="تعریف مجموعه‌های آسترو")
+    parser.add_argument("--check", type=int, metavar="N", default=0,
+                        help="به‌جای ساخت، دو بک‌اند را روی N سند مصنوعی مقایسه کن (نیاز به scipy)")
+    args = parser.parse_args()
+
+    if args.check:
+        return check_backends(args.check, args.k)
+
+    content_dir = Path(args.directory)
+    docs = load_docs(content_dir, registered_collections(Path(args.config)))
+    artifact = build_artifact(docs, args.k)
+
+    output = Path(args.output)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(artifact, f, ensure_ascii=False, separators=(",", ":"))
+
+    linked = sum(len(v) for v in artifact["related"].values())
+    print(f"\n🔗 {linked} مطلب با همسایه از {len(docs)} فایل — ذخیره شد: {output}")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
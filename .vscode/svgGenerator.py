@@ -4,13 +4,18 @@ SVG Cover Generator — تولید خودکار کاور SVG برای مقالا
 بدون نیاز به API خارجی — خروجی SVG سه‌بعدی با عمق و سایه
 """
 
+import io
 import json
 import math
 import random
 import hashlib
 from pathlib import Path
+from functools import lru_cache
 from dataclasses import dataclass
 
+from coverTask import CoverTask
+from rasterizers import RASTERIZERS, Rasterizer, get_rasterizer
+
 
 # ─────────────────────────────────────────────────────
 # تنظیمات
@@ -23,7 +28,7 @@ OUTPUT_DIR = Path("./generated-covers")
 # ─────────────────────────────────────────────────────
 # تم‌های رنگی بر اساس موضوع
 # ─────────────────────────────────────────────────────
-@dataclass
+@dataclass(frozen=True)
 class Theme:
     name: str
     bg_start: str
@@ -121,6 +126,7 @@ def seeded_random(slug: str, index: int = 0) -> random.Random:
     return random.Random(seed)
 
 
+@lru_cache(maxsize=None)
 def svg_defs(theme: Theme) -> str:
     return f"""  <defs>
     <linearGradient id="bg" x1="0%" y1="0%" x2="100%" y2="100%">
@@ -155,6 +161,7 @@ def svg_defs(theme: Theme) -> str:
   </defs>"""
 
 
+@lru_cache(maxsize=None)
 def svg_background(theme: Theme) -> str:
     return f"""  <rect width="{WIDTH}" height="{HEIGHT}" fill="url(#bg)"/>
   <rect width="{WIDTH}" height="{HEIGHT}" fill="url(#glow)"/>"""
@@ -331,6 +338,7 @@ def svg_particles(theme: Theme, slug: str, count: int = 20) -> str:
     return f'  <g fill="{theme.particle}">\n' + "\n".join(parts) + "\n  </g>"
 
 
+@lru_cache(maxsize=None)
 def svg_bottom_fog(theme: Theme) -> str:
     """مه پایین — عمق بیشتر."""
     return f"""  <rect x="0" y="{HEIGHT - 250}" width="{WIDTH}" height="250"
@@ -342,6 +350,18 @@ def svg_bottom_fog(theme: Theme) -> str:
 # ─────────────────────────────────────────────────────
 # تولید SVG نهایی
 # ─────────────────────────────────────────────────────
+def svg_dynamic_layers(theme: Theme, slug: str) -> list[str]:
+    """لایه‌های وابسته به slug — بین پس‌زمینه و مه قرار می‌گیرند."""
+    return [
+        svg_stars(slug),
+        svg_mountains(theme, slug),
+        svg_connecting_lines(theme, slug),
+        svg_geometric_shapes(theme, slug),
+        svg_central_symbol(theme, slug),
+        svg_particles(theme, slug),
+    ]
+
+
 def generate_cover_svg(task: dict) -> str:
     """یک SVG کامل برای یک تسک تولید کن."""
     theme = detect_theme(task)
@@ -352,12 +372,7 @@ def generate_cover_svg(task: dict) -> str:
         f"  <!-- Cover: {task.get('title', '')} -->",
         svg_defs(theme),
         svg_background(theme),
-        svg_stars(slug),
-        svg_mountains(theme, slug),
-        svg_connecting_lines(theme, slug),
-        svg_geometric_shapes(theme, slug),
-        svg_central_symbol(theme, slug),
-        svg_particles(theme, slug),
+        *svg_dynamic_layers(theme, slug),
         svg_bottom_fog(theme),
         "</svg>",
     ]
@@ -365,6 +380,135 @@ def generate_cover_svg(task: dict) -> str:
     return "\n\n".join(parts)
 
 
+# ─────────────────────────────────────────────────────
+# ذخیره SVG / PNG
+# ─────────────────────────────────────────────────────
+_rasterizer = None
+_pil_image = None
+
+
+def default_rasterizer() -> Rasterizer:
+    """بک‌اند پیش‌فرض (cairosvg) — فقط یک بار ساخته می‌شود."""
+    global _rasterizer
+    if _rasterizer is None:
+        _rasterizer = get_rasterizer("cairosvg", WIDTH, HEIGHT)
+    return _rasterizer
+
+
+def export_png(svg_content: str, png_path: Path, rasterizer: Rasterizer | None = None):
+    """SVG را به PNG تبدیل کن."""
+    (rasterizer or default_rasterizer()).render(svg_content, png_path)
+
+
+# ─────────────────────────────────────────────────────
+# حالت ترکیب لایه‌ها — لایه‌های ثابت هر تم یک بار رستر می‌شوند
+# ─────────────────────────────────────────────────────
+_layer_cache: dict[tuple[str, str, str], object] = {}
+
+
+def _pil():
+    """Pillow هم مثل cairosvg فقط یک بار import می‌شود."""
+    global _pil_image
+    if _pil_image is None:
+        from PIL import Image
+        _pil_image = Image
+    return _pil_image
+
+
+def _raster(svg_content: str, rasterizer: Rasterizer | None = None):
+    """SVG → تصویر RGBA در حافظه."""
+    data = (rasterizer or default_rasterizer()).to_bytes(svg_content)
+    return _pil().open(io.BytesIO(data)).convert("RGBA")
+
+
+def _wrap(*parts: str) -> str:
+    return "\n\n".join([
+        f'<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 {WIDTH} {HEIGHT}">',
+        *parts,
+        "</svg>",
+    ])
+
+
+def theme_layer(
+    theme: Theme, which: str, cache_dir: Path | None = None,
+    rasterizer: Rasterizer | None = None,
+):
+    """
+    لایه ثابت تم را برمی‌گرداند: "background" (گرادیان + glow) یا "fog".
+    کش در حافظه؛ با cache_dir روی دیسک هم ذخیره می‌شود (کلید: بک‌اند + هش SVG لایه).
+    """
+    rasterizer = rasterizer or default_rasterizer()
+    if which == "background":
+        svg_content = _wrap(svg_defs(theme), svg_background(theme))
+    else:
+        svg_content = _wrap(svg_bottom_fog(theme))
+
+    key = hashlib.md5(svg_content.encode()).hexdigest()[:12]
+    cached = _layer_cache.get((rasterizer.name, which, key))
+    if cached is not None:
+        return cached
+
+    disk_path = cache_dir / f"{theme.name}-{which}-{rasterizer.name}-{key}.png" if cache_dir else None
+    if disk_path and disk_path.exists():
+        layer = _pil().open(disk_path).convert("RGBA")
+    else:
+        layer = _raster(svg_content, rasterizer)
+        if disk_path:
+            disk_path.parent.mkdir(parents=True, exist_ok=True)
+            layer.save(disk_path)
+
+    _layer_cache[(rasterizer.name, which, key)] = layer
+    return layer
+
+
+def export_png_composited(
+    task: dict, png_path: Path, cache_dir: Path | None = None,
+    rasterizer: Rasterizer | None = None,
+):
+    """
+    فقط لایه‌های پویا رستر می‌شوند و روی پس‌زمینه کش‌شده‌ی تم
+    alpha-composite می‌شوند؛ مه پایین هم از کش روی آن قرار می‌گیرد.
+    """
+    theme = detect_theme(task)
+    slug = task.get("slug", "untitled")
+
+    background = theme_layer(theme, "background", cache_dir, rasterizer)
+    fog = theme_layer(theme, "fog", cache_dir, rasterizer)
+    dynamic = _raster(_wrap(svg_defs(theme), *svg_dynamic_layers(theme, slug)), rasterizer)
+
+    image = _pil().alpha_composite(background, dynamic)
+    image.alpha_composite(fog)
+    image.save(png_path)
+
+
+def write_cover(
+    task: dict, out: Path, png: bool = False,
+    composite: bool = False, layer_cache: Path | None = None,
+    rasterizer: Rasterizer | None = None, pending: list | None = None,
+) -> list[Path]:
+    """
+    کاور یک تسک را در پوشه out ذخیره کن و مسیر فایل‌ها را برگردان.
+    با pending، رستر PNG به تعویق می‌افتد تا بعداً دسته‌ای انجام شود.
+    """
+    slug = task.get("slug", "untitled")
+    svg_content = generate_cover_svg(task)
+
+    svg_path = out / f"{slug}-cover.svg"
+    svg_path.write_text(svg_content, encoding="utf-8")
+    paths = [svg_path]
+
+    if png:
+        png_path = out / f"{slug}-cover.png"
+        if composite:
+            export_png_composited(task, png_path, layer_cache, rasterizer)
+        elif pending is not None:
+            pending.append((svg_content, png_path))
+        else:
+            export_png(svg_content, png_path, rasterizer)
+        paths.append(png_path)
+    return paths
+
+
 # ─────────────────────────────────────────────────────
 # خواندن تسک‌ها و تولید دسته‌جمعی
 # ─────────────────────────────────────────────────────
@@ -386,46 +530,85 @@ def main():
         action="store_true",
         help="تبدیل به PNG هم انجام بشه (نیاز به cairosvg)"
     )
+    parser.add_argument(
+        "--composite",
+        action="store_true",
+        help="PNG با ترکیب لایه‌ها: پس‌زمینه هر تم یک بار رستر می‌شود (یعنی --png؛ نیاز به Pillow)"
+    )
+    parser.add_argument(
+        "--layer-cache",
+        default=None,
+        help="پوشه کش دیسکی لایه‌های ثابت تم (اختیاری)"
+    )
+    parser.add_argument(
+        "--rasterizer",
+        choices=list(RASTERIZERS),
+        default=None,
+        help="بک‌اند تبدیل PNG (پیش‌فرض با --png: cairosvg)"
+    )
+    parser.add_argument(
+        "-j", "--jobs",
+        type=int,
+        default=1,
+        help="تعداد پردازه‌های هم‌زمان برای بک‌اندهای زیرپردازه‌ای"
+    )
     args = parser.parse_args()
+    if args.composite:
+        if args.rasterizer == "none":
+            parser.error("--composite خروجی PNG است و با --rasterizer none نمی‌خواند")
+        args.png = True
 
     # خواندن تسک‌ها
     with open(args.input_json, "r", encoding="utf-8") as f:
-        tasks = json.load(f)
+        raw_tasks = json.load(f)
+
+    # رکوردهای فشرده به‌جای dict — پرامپت‌ها فقط در صورت نیاز ساخته می‌شوند.
+    # هر dict همان لحظه رها می‌شود تا dictها و رکوردها با هم در حافظه نمانند.
+    raw_tasks.reverse()
+    tasks = []
+    while raw_tasks:
+        raw = raw_tasks.pop()
+        tasks.append(CoverTask.from_dict({"slug": f"cover-{len(tasks) + 1}", **raw}))
 
     out = Path(args.output_dir)
     out.mkdir(parents=True, exist_ok=True)
 
     print(f"🎨 تولید {len(tasks)} کاور SVG ...\n")
 
+    # انتخاب بک‌اند PNG
+    name = args.rasterizer or ("cairosvg" if args.png else "none")
+    try:
+        rasterizer = get_rasterizer(name, WIDTH, HEIGHT, args.jobs)
+    except ImportError:
+        hint = "pip install cairosvg" if name == "cairosvg" else f"{name} را نصب کن و در PATH بگذار"
+        print(f"  ⚠️  {name} در دسترس نیست — فقط SVG ساخته می‌شود ({hint})\n")
+        rasterizer = get_rasterizer("none")
+    png = rasterizer.name != "none"
+    layer_cache = Path(args.layer_cache) if args.layer_cache else None
+    pending = []
+
     for i, task in enumerate(tasks, 1):
-        slug = task.get("slug", f"cover-{i}")
-        svg_content = generate_cover_svg(task)
-
-        # ذخیره SVG
-        svg_path = out / f"{slug}-cover.svg"
-        svg_path.write_text(svg_content, encoding="utf-8")
-        print(f"  ✅ [{i:02d}/{len(tasks)}] {svg_path.name}")
-
-        # تبدیل به PNG (اختیاری)
-        if args.png:
-            try:
-                import cairosvg
-                png_path = out / f"{slug}-cover.png"
-                cairosvg.svg2png(
-                    bytestring=svg_content.encode(),
-                    write_to=str(png_path),
-                    output_width=WIDTH,
-                    output_height=HEIGHT,
-                )
-                print(f"       → PNG: {png_path.name}")
-            except ImportError:
-                print("  ⚠️  cairosvg نصب نیست: pip install cairosvg")
-                break
+        try:
+            paths = write_cover(
+                task, out, png=png, composite=args.composite,
+                layer_cache=layer_cache, rasterizer=rasterizer, pending=pending,
+            )
+        except ImportError as e:
+            print(f"  ⚠️  {e.name} نصب نیست: pip install {'pillow' if e.name == 'PIL' else 'cairosvg'}")
+            break
+        print(f"  ✅ [{i:02d}/{len(tasks)}] {paths[0].name}")
+        if args.composite and len(paths) > 1:
+            print(f"       → PNG: {paths[1].name}")
+
+    # PNGهای غیرترکیبی یک‌جا رستر می‌شوند (بک‌اندهای زیرپردازه‌ای موازی)
+    if pending:
+        print(f"\n🖼️  تبدیل {len(pending)} PNG با {rasterizer.name} ...")
+        rasterizer.render_many(pending)
 
     print(f"\n{'─' * 50}")
     print(f"📊 خلاصه: {len(tasks)} کاور در {out.resolve()}")
-    if args.png:
-        print(f"   فرمت: SVG + PNG")
+    if png:
+        print(f"   فرمت: SVG + PNG ({rasterizer.name})")
     else:
         print(f"   فرمت: SVG")
         print(f"   💡 برای PNG: python cover_svg.py tasks.json --png")
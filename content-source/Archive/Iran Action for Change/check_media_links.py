@@ -0,0 +1,235 @@
+#!/usr/bin/env python3
+"""
+check_media_links.py
+
+Validates every '![...](...)' media reference in the archived HTML against
+an asset index that is built ONCE per run (no os.path.exists per link).
+
+The index holds normalized relative paths and basenames of every file under
+the archive folder and the site's public/ folder. Normalization: URL-decoding,
+Unicode NFC, '\\' → '/', and case-folding.
+
+Each reference is classified as:
+    ✅ ok         exact file exists
+    🔧 fixable    a single file matches after normalization / by basename
+    ❓ ambiguous  several files share the basename
+    ❌ missing    nothing matches
+"""
+
+import os
+import sys
+import glob
+import time
+import json
+import bisect
+import argparse
+import posixpath
+import unicodedata
+from collections import Counter, defaultdict
+from datetime import datetime
+from urllib.parse import unquote, urlsplit
+
+from fix_html_media_links import RE_MD_IMAGE, RE_PROTECTED
+
+EXTERNAL_SCHEMES = ("http", "https", "data", "mailto", "ftp")
+REPORT_NAME = "media_link_report.md"
+
+
+def normalize(path: str) -> str:
+    """Decode, unify separators and case so lookups ignore cosmetic differences."""
+    path = unicodedata.normalize("NFC", unquote(path)).replace("\\", "/")
+    return posixpath.normpath(path).lstrip("/").casefold()
+
+
+class AssetIndex:
+    """All media files under the given roots, keyed by exact path, normalized path and basename."""
+
+    def __init__(self, roots: dict[str, str]):
+        self.roots = roots  # label → directory
+        self.exact: set[tuple[str, str]] = set()
+        self.by_path: dict[str, list[tuple[str, str]]] = defaultdict(list)
+        self.by_name: dict[str, list[tuple[str, str]]] = defaultdict(list)
+
+        for label, root in roots.items():
+            for dirpath, _, filenames in os.walk(root):
+                for name in filenames:
+                    if name.lower().endswith((".html", ".htm", ".py", ".md")):
+                        continue
+                    rel = os.path.relpath(os.path.join(dirpath, name), root).replace(os.sep, "/")
+                    rel = unicodedata.normalize("NFC", rel)
+                    self.exact.add((label, rel))
+                    self.by_path[normalize(rel)].append((label, rel))
+                    self.by_name[normalize(name)].append((label, rel))
+
+    @property
+    def size(self) -> int:
+        return len(self.exact)
+
+    def resolve(self, ref: str, html_rel_dir: str) -> tuple[str, list[tuple[str, str]]]:
+        """(status, candidates) for one reference found in a file at html_rel_dir."""
+        parts = urlsplit(ref)
+        if parts.scheme in EXTERNAL_SCHEMES or ref.startswith("//"):
+            return "external", []
+
+        decoded = unicodedata.normalize("NFC", unquote(parts.path)).replace("\\", "/")
+        if decoded.startswith("/"):
+            # site-absolute → public/
+            target = ("public", posixpath.normpath(decoded).lstrip("/"))
+        else:
+            target = ("archive", posixpath.normpath(posixpath.join(html_rel_dir, decoded)))
+
+        if target in self.exact:
+            return "ok", [target]
+
+        hits = self.by_path.get(normalize(target[1]), [])
+        if len(hits) == 1:
+            return "fixable", hits
+
+        hits = self.by_name.get(normalize(posixpath.basename(decoded)), [])
+        if len(hits) == 1:
+            return "fixable", hits
+        if len(hits) > 1:
+            return "ambiguous", hits
+        return "missing", []
+
+
+def suggest_link(candidate: tuple[str, str], html_rel_dir: str) -> str:
+    """The link text that would point at candidate from the HTML file."""
+    label, rel = candidate
+    if label == "public":
+        return "/" + rel
+    return posixpath.relpath(rel, html_rel_dir or ".")
+
+
+def scan_file(html_path: str, archive: str, index: AssetIndex) -> tuple[list[dict], int]:
+    """All references in one HTML file (outside <pre> blocks), resolved against the index."""
+    raw = open(html_path, "rb").read()
+    try:
+        content = raw.decode("utf-8-sig")
+    except UnicodeDecodeError:
+        content = raw.decode("latin-1")
+
+    protected = [m.span() for m in RE_PROTECTED.finditer(content)]
+    starts = [s for s, _ in protected]
+    newlines = [i for i, ch in enumerate(content) if ch == "\n"]
+    html_rel_dir = posixpath.dirname(os.path.relpath(html_path, archive).replace(os.sep, "/"))
+
+    refs = []
+    for match in RE_MD_IMAGE.finditer(content):
+        pos = match.start()
+        k = bisect.bisect_right(starts, pos) - 1
+        if k >= 0 and pos < protected[k][1]:
+            continue
+        ref = match.group(2)
+        status, candidates = index.resolve(ref, html_rel_dir)
+        refs.append({
+            "file": os.path.relpath(html_path, archive),
+            "line": bisect.bisect_right(newlines, pos) + 1,
+            "alt": match.group(1),
+            "ref": ref,
+            "status": status,
+            "candidates": [suggest_link(c, html_rel_dir) for c in candidates],
+        })
+    return refs, len(protected)
+
+
+def find_public(start: str) -> str | None:
+    """Walks up from start to the site root (the folder holding public/ and package.json)."""
+    current = os.path.abspath(start)
+    while True:
+        if os.path.isdir(os.path.join(current, "public")) and os.path.exists(os.path.join(current, "package.json")):
+            return os.path.join(current, "public")
+        parent = os.path.dirname(current)
+        if parent == current:
+            return None
+        current = parent
+
+
+def build_report(refs: list[dict], archive: str, index: AssetIndex, files: int, protected: int, elapsed: float) -> str:
+    counts = Counter(r["status"] for r in refs)
+    lines = [
+        "# 📋 Media Link Check Report\n\n",
+        "| Info | Value |\n|------|-------|\n",
+        f"| **Date** | `{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}` |\n",
+        f"| **Folder** | `{os.path.abspath(archive)}` |\n",
+        f"| **Elapsed** | `{elapsed:.2f}s` |\n",
+        f"| **Media indexed** | `{index.size}` files (`{len(index.by_name)}` unique names) |\n",
+        f"| **Protected `<pre>` blocks** | `{protected}` (skipped) |\n\n",
+        "## Summary\n\n",
+        "| Metric | Count |\n|--------|------:|\n",
+        f"| HTML files scanned | {files} |\n",
+        f"| References found | {len(refs)} |\n",
+        f"| ✅ OK | {counts['ok']} |\n",
+        f"| 🔧 Fixable | {counts['fixable']} |\n",
+        f"| ❓ Ambiguous | {counts['ambiguous']} |\n",
+        f"| ❌ Missing | {counts['missing']} |\n",
+        f"| 🌐 External (not checked) | {counts['external']} |\n\n",
+    ]
+
+    sections = [("fixable", "🔧 Fixable"), ("ambiguous", "❓ Ambiguous"), ("missing", "❌ Missing")]
+    for status, title in sections:
+        rows = [r for r in refs if r["status"] == status]
+        if not rows:
+            continue
+        lines.append(f"## {title}\n\n| File | Line | Reference | Candidates |\n|------|-----:|-----------|------------|\n")
+        for r in rows:
+            candidates = "<br>".join(f"`{c}`" for c in r["candidates"]) or "—"
+            lines.append(f"| `{r['file']}` | {r['line']} | `{r['ref']}` | {candidates} |\n")
+        lines.append("\n")
+
+    if not refs:
+        lines.append("*No markdown-style media references found.*\n\n")
+    lines.append("---\n\n")
+    return "".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Validate media links in archived HTML")
+    parser.add_argument("archive", nargs="?", default=".", help="archive folder (default: .)")
+    parser.add_argument("--public", default=None, help="site public/ folder (default: auto-detect)")
+    parser.add_argument("--json", default=None, help="also write the raw results as JSON")
+    parser.add_argument("--no-report", action="store_true", help="print the summary only")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    roots = {"archive": args.archive}
+    public = args.public or find_public(args.archive)
+    if public:
+        roots["public"] = public
+    index = AssetIndex(roots)
+
+    html_files = []
+    for ext in ("*.html", "*.htm"):
+        html_files.extend(glob.glob(os.path.join(args.archive, "**", ext), recursive=True))
+    if not html_files:
+        print("❌ No HTML files found!")
+        return 1
+
+    refs, protected = [], 0
+    for html_path in sorted(html_files):
+        file_refs, file_protected = scan_file(html_path, args.archive, index)
+        refs.extend(file_refs)
+        protected += file_protected
+
+    report = build_report(refs, args.archive, index, len(html_files), protected, time.perf_counter() - started)
+    counts = Counter(r["status"] for r in refs)
+    print(f"📊 {len(refs)} references in {len(html_files)} file(s): "
+          f"✅ {counts['ok']}  🔧 {counts['fixable']}  ❓ {counts['ambiguous']}  ❌ {counts['missing']}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(refs, f, ensure_ascii=False, indent=2)
+
+    if not args.no_report:
+        # newest report on top, like fix_report.md
+        report_path = os.path.join(args.archive, REPORT_NAME)
+        previous = open(report_path, encoding="utf-8").read() if os.path.exists(report_path) else ""
+        with open(report_path, "w", encoding="utf-8") as f:
+            f.write(report + previous)
+        print(f"📝 Report: {report_path}")
+
+    return 1 if counts["missing"] or counts["ambiguous"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -12,7 +12,7 @@ import glob
 from typing import List, Tuple
 
 # Same regex as main script
-RE_MD_IMAGE = re.compile(r'!$$([^$$]*)\]\(([^)\s]+)\)')
+RE_MD_IMAGE = re.compile(r'!\[([^\]]*)\]\(([^)\s]+)\)')
 RE_PROTECTED = re.compile(r'<pre[^>]*>.*?</pre>', re.DOTALL | re.IGNORECASE)
 
 def diagnose_file(html_path: str):
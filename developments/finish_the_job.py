@@ -1,8 +1,8 @@
-import os
+from pathlib import Path
+
+from rewrite_engine import Rule, report, run
 
 filepath = 'keystatic.config.ts'
-with open(filepath, 'r', encoding='utf-8') as f:
-    orig_content = f.read()
 
 # 1. PREPARE THE NEW GROUPS (removed duplicated lang)
 identity_fields = """const identityFields = {
@@ -33,18 +33,26 @@ classification_fields = """const classificationFields = {
 # 2. FIX navigation labels (ensure they are clean)
 # 3. FIX slugField usage (ensure it is consistent)
 
-# Global replacements
-content = orig_content
-# Ensure lang is not duplicated
-content = re.sub(r'const classificationFields = \{.*?\};', classification_fields, content, flags=re.DOTALL)
-
-# Ensure slug field is required and has valid description
-content = content.replace("slug:        fields.text({ label: 'Identifier (English/Slug)', description: 'MUST match the English filename for the URL to work.', validation: { isRequired: true } }),",
-                         "slug:        fields.text({ label: 'Slug / Identifier', description: 'URL-friendly ID (e.g. "my-article-title"). Must match filename.', validation: { isRequired: true } }),")
-
-# Fix navigation labels (Persian flag, English flag)
-content = content.replace("'PERSIAN (FA)'", "' Persian (fa)'")
-content = content.replace("'ENGLISH (EN)'", "' English (en)'")
-
-with open(filepath, 'w', encoding='utf-8') as f:
-    f.write(content)
+# All patches as declarative rules — applied to the file in a single pass
+RULES = [
+    # Ensure lang is not duplicated
+    Rule(
+        name="classification-fields",
+        pattern=r"const classificationFields = \{.*?\};",
+        replace=classification_fields.replace("\\", "\\\\"),
+        flags="s",
+    ),
+    # Ensure slug field is required and has valid description
+    Rule(
+        name="slug-field",
+        pattern="slug:        fields.text({ label: 'Identifier (English/Slug)', description: 'MUST match the English filename for the URL to work.', validation: { isRequired: true } }),",
+        replace="slug:        fields.text({ label: 'Slug / Identifier', description: 'URL-friendly ID (e.g. \"my-article-title\"). Must match filename.', validation: { isRequired: true } }),",
+        literal=True,
+    ),
+    # Fix navigation labels (Persian flag, English flag)
+    Rule(name="nav-fa", pattern="'PERSIAN (FA)'", replace="'🇮🇷 Persian (fa)'", literal=True),
+    Rule(name="nav-en", pattern="'ENGLISH (EN)'", replace="'🇬🇧 English (en)'", literal=True),
+]
+
+if __name__ == "__main__":
+    raise SystemExit(report(run(RULES, [Path(filepath)]), dry_run=False))
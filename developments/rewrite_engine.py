@@ -0,0 +1,261 @@
+#!/usr/bin/env python3
+"""
+Single-pass bulk rewrite engine for MDX frontmatter and config files.
+
+A declarative list of rules is compiled into ONE alternation regex, so each
+file is scanned once no matter how many rules there are (instead of one
+full-file re.sub / str.replace per rule). Files are processed in parallel,
+every write is atomic, and each result is re-run through the engine to make
+sure the rules are idempotent before anything touches disk.
+
+Usage:
+    python developments/rewrite_engine.py --rules rules.yaml src/content --glob "*.mdx" --dry-run
+    python developments/rewrite_engine.py --rules rules.json keystatic.config.ts
+
+Rules file (YAML or JSON) — a list of:
+    - name: fix-lang          # used in reports
+      pattern: "^lang: farsi$"
+      replace: "lang: fa"     # regex replacement template (\\1, \\g<name>)
+      flags: "m"              # any of i, m, s, x
+      literal: false          # true = pattern/replace are plain strings
+      scope: frontmatter      # all | frontmatter
+      glob: "*.mdx"           # only apply to matching file names
+
+Because all rules share one regex, a pattern must not backreference its own
+groups (\\1 inside the pattern) and named groups must be unique across rules.
+"""
+
+import os
+import re
+import sys
+import json
+import shutil
+import difflib
+import fnmatch
+import argparse
+import tempfile
+from collections import Counter
+from dataclasses import dataclass
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
+
+FRONTMATTER_PATTERN = re.compile(r"^---\s*\n.*?\n---", re.DOTALL)
+INLINE_FLAGS = set("imsx")
+
+
+@dataclass(frozen=True)
+class Rule:
+    name: str
+    pattern: str
+    replace: str
+    flags: str = ""
+    literal: bool = False
+    scope: str = "all"
+    glob: str = "*"
+
+    def source(self) -> str:
+        """Pattern as a regex with its flags scoped to this rule only."""
+        body = re.escape(self.pattern) if self.literal else self.pattern
+        flags = "".join(sorted(set(self.flags) & INLINE_FLAGS))
+        return f"(?{flags}:{body})" if flags else f"(?:{body})"
+
+    def applies_to(self, path: Path) -> bool:
+        return fnmatch.fnmatch(path.name, self.glob)
+
+
+class Matcher:
+    """All rules of one scope compiled into a single regex."""
+
+    def __init__(self, rules: list[Rule]):
+        self.rules = rules
+        self.regex = re.compile(
+            "|".join(f"(?P<r{i}>{rule.source()})" for i, rule in enumerate(rules))
+        ) if rules else None
+        # each rule's own regex, used to expand backreferences in its template
+        self.singles = [re.compile(rule.source()) for rule in rules]
+
+    def sub(self, text: str, hits: Counter) -> str:
+        if self.regex is None:
+            return text
+
+        def replace(match: re.Match) -> str:
+            index = int(match.lastgroup[1:])
+            rule = self.rules[index]
+            hits[rule.name] += 1
+            if rule.literal:
+                return rule.replace
+            own = self.singles[index].match(match.string, match.start())
+            return own.expand(rule.replace)
+
+        # leftmost match wins; on ties the earlier rule wins
+        return self.regex.sub(replace, text)
+
+
+class RewriteEngine:
+    def __init__(self, rules: list[Rule]):
+        for rule in rules:
+            if rule.scope not in ("all", "frontmatter"):
+                raise ValueError(f"unknown scope '{rule.scope}' in rule '{rule.name}'")
+            re.compile(rule.source())  # fail fast on bad patterns
+        Matcher(rules)  # ...and on group names that clash between rules
+        self.rules = rules
+        self._matchers: dict[tuple, tuple[Matcher, Matcher]] = {}
+
+    def matchers_for(self, path: Path) -> tuple[Matcher, Matcher]:
+        """(frontmatter-only, whole-file) matchers for the rules that apply to path."""
+        active = tuple(i for i, rule in enumerate(self.rules) if rule.applies_to(path))
+        if active not in self._matchers:
+            picked = [self.rules[i] for i in active]
+            self._matchers[active] = (
+                Matcher([r for r in picked if r.scope == "frontmatter"]),
+                Matcher([r for r in picked if r.scope == "all"]),
+            )
+        return self._matchers[active]
+
+    def rewrite_text(self, text: str, path: Path) -> tuple[str, Counter]:
+        hits: Counter = Counter()
+        frontmatter, everywhere = self.matchers_for(path)
+
+        if frontmatter.regex is not None:
+            match = FRONTMATTER_PATTERN.match(text)
+            if match:
+                head = frontmatter.sub(match.group(0), hits)
+                text = head + text[match.end():]
+
+        return everywhere.sub(text, hits), hits
+
+
+# ─────────────────────────────────────────────
+# File processing
+# ─────────────────────────────────────────────
+def atomic_write(path: Path, text: str):
+    """Write to a temp file in the same directory, then rename over the original.
+
+    mkstemp creates the temp file as 0600; the original's mode is copied over
+    so a rewrite does not change file permissions.
+    """
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8", newline="") as f:
+            f.write(text)
+        if path.exists():
+            shutil.copymode(path, tmp)
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.unlink(tmp)
+        raise
+
+
+_engine: RewriteEngine | None = None
+
+
+def _init_worker(rules: list[Rule]):
+    global _engine
+    _engine = RewriteEngine(rules)
+
+
+def process_file(path: Path, dry_run: bool) -> dict:
+    """Rewrite one file; returns a result record (never raises)."""
+    result = {"path": str(path), "hits": {}, "changed": False, "diff": "", "error": ""}
+    try:
+        with open(path, "r", encoding="utf-8", newline="") as f:
+            original = f.read()
+
+        updated, hits = _engine.rewrite_text(original, path)
+        result["hits"] = dict(hits)
+        if updated == original:
+            return result
+
+        again, extra = _engine.rewrite_text(updated, path)
+        if again != updated:
+            result["error"] = f"not idempotent: {', '.join(sorted(extra))}"
+            return result
+
+        result["changed"] = True
+        if dry_run:
+            result["diff"] = "".join(difflib.unified_diff(
+                original.splitlines(keepends=True), updated.splitlines(keepends=True),
+                fromfile=f"a/{path}", tofile=f"b/{path}",
+            ))
+        else:
+            atomic_write(path, updated)
+    except Exception as e:
+        result["error"] = f"{type(e).__name__}: {e}"
+    return result
+
+
+def collect_files(targets: list[str], glob: str) -> list[Path]:
+    files = []
+    for target in targets:
+        path = Path(target)
+        if path.is_dir():
+            files.extend(sorted(p for p in path.rglob(glob) if p.is_file()))
+        elif path.exists():
+            files.append(path)
+        else:
+            print(f"⚠️  not found: {target}", file=sys.stderr)
+    return files
+
+
+def run(rules: list[Rule], files: list[Path], dry_run: bool = False, jobs: int | None = None) -> list[dict]:
+    """Apply rules to files (in parallel when jobs != 1)."""
+    if jobs == 1 or len(files) < 2:
+        _init_worker(rules)
+        return [process_file(path, dry_run) for path in files]
+
+    with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker, initargs=(rules,)) as pool:
+        chunk = max(1, len(files) // ((jobs or os.cpu_count() or 1) * 4))
+        return list(pool.map(process_file, files, [dry_run] * len(files), chunksize=chunk))
+
+
+def load_rules(path: str) -> list[Rule]:
+    with open(path, "r", encoding="utf-8") as f:
+        if path.endswith((".yaml", ".yml")):
+            import yaml
+            data = yaml.safe_load(f)
+        else:
+            data = json.load(f)
+    return [Rule(**item) for item in data]
+
+
+def report(results: list[dict], dry_run: bool) -> int:
+    totals: Counter = Counter()
+    changed = errors = 0
+    for result in results:
+        totals.update(result["hits"])
+        if result["error"]:
+            errors += 1
+            print(f"❌ {result['path']}: {result['error']}")
+        elif result["changed"]:
+            changed += 1
+            if dry_run:
+                sys.stdout.write(result["diff"])
+            else:
+                print(f"✅ {result['path']}")
+
+    verb = "would change" if dry_run else "changed"
+    print(f"\n📊 {len(results)} files scanned, {changed} {verb}, {errors} errors")
+    for name, count in totals.most_common():
+        print(f"   {name:<32} {count}")
+    return 1 if errors else 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Single-pass bulk rewrite of MDX/config files")
+    parser.add_argument("targets", nargs="+", help="files or directories")
+    parser.add_argument("-r", "--rules", required=True, help="rules file (.yaml/.yml/.json)")
+    parser.add_argument("-g", "--glob", default="*.mdx", help="file pattern inside directories (default: *.mdx)")
+    parser.add_argument("-n", "--dry-run", action="store_true", help="print a unified diff, write nothing")
+    parser.add_argument("-j", "--jobs", type=int, default=None, help="worker processes (default: CPU count)")
+    args = parser.parse_args()
+
+    rules = load_rules(args.rules)
+    RewriteEngine(rules)  # validate before spawning workers
+    files = collect_files(args.targets, args.glob)
+    results = run(rules, files, dry_run=args.dry_run, jobs=args.jobs)
+    return report(results, args.dry_run)
+
+
+if __name__ == "__main__":
+    sys.exit(main())